@@ -6,7 +6,7 @@ API 路由註冊模組
 
 from fastapi import FastAPI
 
-from .routes import chat, dictionary, grammar, speech, translation
+from .routes import analyze, chat, dictionary, grammar, speech, translation
 
 
 def register_routes(app: FastAPI) -> None:
@@ -26,6 +26,7 @@ def register_routes(app: FastAPI) -> None:
     app.include_router(dictionary.router)
     app.include_router(grammar.router)
     app.include_router(translation.router)
+    app.include_router(analyze.router)
 
 
 __all__ = ["register_routes"]
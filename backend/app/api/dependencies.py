@@ -10,7 +10,9 @@ from pathlib import Path
 
 from ..core import settings
 from ..services import STTService, TTSService
+from ..services.audit_writer import AuditWriter
 from ..services.llm import LLMService
+from ..services.semantic_cache import SemanticCache
 
 
 @lru_cache
@@ -23,12 +25,10 @@ def get_audio_directory() -> Path:
     
     說明:
         確保持久化音訊目錄存在並返回其路徑。
-        如果目錄不存在，會自動建立。
+        如果目錄不存在，會自動建立（parents=True 會一併建立基礎目錄）。
         使用 lru_cache 確保目錄只檢查和建立一次。
     """
-    base_dir = settings.data_directory
-    base_dir.mkdir(parents=True, exist_ok=True)
-    audio_dir = base_dir / "audio"
+    audio_dir = settings.data_directory / "audio"
     audio_dir.mkdir(parents=True, exist_ok=True)
     return audio_dir
 
@@ -96,9 +96,44 @@ def get_llm_service() -> LLMService:
     )
 
 
+@lru_cache
+def get_audit_writer() -> AuditWriter:
+    """
+    取得稽核寫入器的單例實例
+
+    返回:
+        AuditWriter: 背景稽核寫入器
+
+    說明:
+        背景任務由應用程式的 lifespan 啟動與停止；
+        使用 lru_cache 確保整個生命週期共用一個佇列。
+    """
+    return AuditWriter()
+
+
+@lru_cache
+def get_semantic_cache(namespace: str) -> SemanticCache:
+    """
+    取得指定命名空間的語意快取單例
+
+    參數:
+        namespace: 快取命名空間（例如 "translation"、"grammar"）
+
+    返回:
+        SemanticCache: 該命名空間專屬的語意快取實例
+
+    說明:
+        每個端點使用獨立的語意快取，避免不同任務的回應互相污染。
+        未安裝可選依賴或未啟用設定時，實例會自動停用。
+    """
+    return SemanticCache()
+
+
 __all__ = [
     "get_audio_directory",
+    "get_audit_writer",
     "get_llm_service",
+    "get_semantic_cache",
     "get_stt_service",
     "get_tts_service",
 ]
@@ -1,3 +1,3 @@
-from . import chat, dictionary, grammar, speech, translation
+from . import analyze, chat, dictionary, grammar, speech, translation
 
-__all__ = ["chat", "dictionary", "grammar", "speech", "translation"]
+__all__ = ["analyze", "chat", "dictionary", "grammar", "speech", "translation"]
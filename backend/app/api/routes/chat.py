@@ -1,11 +1,12 @@
 import asyncio
-import json
 import logging
 import re
+from functools import lru_cache
 from typing import List, Tuple
 
+import orjson
 from fastapi import APIRouter, Depends
-from fastapi.responses import StreamingResponse
+from fastapi.responses import ORJSONResponse, StreamingResponse
 
 from ...core import settings
 from ...schemas.chat import ChatMessage, ChatRequest, ChatResponse
@@ -13,7 +14,7 @@ from ...services.llm import LLMService
 from ..dependencies import get_llm_service
 
 log = logging.getLogger(__name__)
-router = APIRouter(tags=["chat"])
+router = APIRouter(tags=["chat"], default_response_class=ORJSONResponse)
 
 _FORBIDDEN_CHARS: frozenset[str] = frozenset(
     {
@@ -41,18 +42,52 @@ _FORBIDDEN_CHARS: frozenset[str] = frozenset(
         '\t',
     }
 )
+_FORBIDDEN_TRANS = str.maketrans("", "", "".join(_FORBIDDEN_CHARS))
+_CLEANUP_RE = re.compile(
+    "([" + re.escape("".join(sorted(_FORBIDDEN_CHARS - {"\n", "\r", "\t"}))) + "])|(\\s+)"
+)
 _WORD_PATTERN = re.compile(r"[A-Za-z]+")
+_FALLBACK_BASE = (
+    "I will keep practising clear English sentences each day to build steady "
+    "confidence and stay calm during our conversation"
+).split()
+_FALLBACK_PADDING = (
+    "I focus on calm pacing and thoughtful ideas while expressing myself and "
+    "encouraging patient progress every day"
+).split() * 10
+# Shared empty dict for missing upstream fields; never mutated, so reusing
+# it avoids a fresh allocation per response.
+_EMPTY_DICT: dict = {}
+_SSE_PREFIX = b"data: "
+_SSE_SUFFIX = b"\n\n"
+_SSE_DONE = b"data: [DONE]\n\n"
+
+
+def _cleanup_match(match: re.Match) -> str:
+    """Drop forbidden symbols, squash whitespace runs to a single space."""
+    return "" if match.group(1) else " "
+
+
+def _clean_reply(text: str) -> str:
+    """Strip forbidden symbols and collapse whitespace in one scan over the text."""
+    return _CLEANUP_RE.sub(_cleanup_match, text).strip()
+
+
+@lru_cache(maxsize=1)
+def _system_message() -> ChatMessage:
+    """Build the default system-prompt message once; the prompt never changes at runtime."""
+    return ChatMessage(role="system", content=settings.llm_system_prompt)
 
 
 def _with_system_prompt(messages: List[ChatMessage]) -> List[ChatMessage]:
     """Prepend default system prompt when none is supplied."""
-    prompt = settings.llm_system_prompt
-    if not prompt:
+    if not settings.llm_system_prompt:
+        return list(messages)
+    # A system message is only meaningful at index 0, so checking the head
+    # suffices — no need to scan the whole history.
+    if messages and messages[0].role == "system":
         return list(messages)
-    for message in messages:
-        if message.role == "system":
-            return list(messages)
-    return [ChatMessage(role="system", content=prompt), *messages]
+    return [_system_message(), *messages]
 
 
 def _normalize_whitespace(text: str) -> str:
@@ -60,11 +95,6 @@ def _normalize_whitespace(text: str) -> str:
     return " ".join(text.strip().split())
 
 
-def _strip_forbidden(text: str) -> str:
-    """Remove symbols that break TTS output or violate classroom rules."""
-    return "".join(ch for ch in text if ch not in _FORBIDDEN_CHARS)
-
-
 def _count_words(text: str) -> int:
     """Count English words using a conservative regex."""
     return len(_WORD_PATTERN.findall(text))
@@ -72,12 +102,14 @@ def _count_words(text: str) -> int:
 
 def _validate_response(content: str) -> Tuple[bool, str]:
     """Check whether an LLM reply satisfies symbol and word-count requirements."""
-    if not content.strip():
+    # str.isspace avoids the strip() copy on the empty-check fast path.
+    if not content or content.isspace():
         return False, "the response was empty"
-    if any(ch in _FORBIDDEN_CHARS for ch in content):
+    if len(content.translate(_FORBIDDEN_TRANS)) != len(content):
         return False, "the response used forbidden symbols or line breaks"
-    normalized = _normalize_whitespace(content)
-    word_total = _count_words(normalized)
+    # Whitespace never changes [A-Za-z]+ matches, so count words on the raw
+    # text and skip the normalization allocation.
+    word_total = _count_words(content)
     if word_total < settings.llm_response_word_min:
         return False, f"the response only used {word_total} words"
     if word_total > settings.llm_response_word_max:
@@ -97,26 +129,16 @@ def _build_retry_instruction(reason: str) -> str:
 
 def _apply_fallback(original: str) -> str:
     """Produce a deterministic filler paragraph when the LLM keeps failing."""
-    sanitized = _normalize_whitespace(_strip_forbidden(original))
-    words = sanitized.split()
+    word_min = settings.llm_response_word_min
+    word_max = settings.llm_response_word_max
+    words = _clean_reply(original).split()
     if not words:
-        words = [
-            "I", "will", "keep", "practising", "clear", "English", "sentences", "each", "day",
-            "to", "build", "steady", "confidence", "and", "stay", "calm", "during", "our", "conversation",
-        ]
-    if len(words) > settings.llm_response_word_max:
-        words = words[: settings.llm_response_word_max]
-    filler = (
-        "I focus on calm pacing and thoughtful ideas while expressing myself and encouraging patient progress every day"
-    ).split()
-    while len(words) < settings.llm_response_word_min:
-        for token in filler:
-            if len(words) >= settings.llm_response_word_max:
-                break
-            words.append(token)
-        if len(words) >= settings.llm_response_word_min:
-            break
-    fallback = " ".join(words[: settings.llm_response_word_max])
+        words = _FALLBACK_BASE
+    words = words[:word_max]
+    if len(words) < word_min:
+        # Slice the precomputed padding instead of looping token by token.
+        words = [*words, *_FALLBACK_PADDING[: word_min - len(words)]]
+    fallback = " ".join(words)
     if not fallback.endswith((".", "!", "?")):
         fallback += "."
     return fallback
@@ -130,12 +152,16 @@ async def _generate_response_with_constraints(
     max_tokens: int | None,
 ) -> Tuple[str, dict]:
     """Call the LLM and enforce hard output constraints with retries and trimming."""
-    attempt_messages = list(messages)
+    # Serialize each message once; retries only append, so re-dumping the
+    # whole history every attempt would be redundant work. Direct attribute
+    # reads skip the pydantic serializer walk entirely.
+    dumped_messages = [{"role": m.role, "content": m.content} for m in messages]
     chosen_temperature = temperature if temperature is not None else settings.llm_default_temperature
+    retry_attempts = settings.llm_response_retry_attempts
     last_raw: dict = {}
-    for attempt in range(settings.llm_response_retry_attempts + 1):
+    for attempt in range(retry_attempts + 1):
         content, last_raw = await llm_service.chat(
-            messages=[m.model_dump() for m in attempt_messages],
+            messages=dumped_messages,
             model=model,
             temperature=chosen_temperature,
             max_tokens=max_tokens,
@@ -143,22 +169,22 @@ async def _generate_response_with_constraints(
         is_valid, reason = _validate_response(content)
         normalized = _normalize_whitespace(content)
         if is_valid:
-            sanitized = _normalize_whitespace(_strip_forbidden(normalized))
-            return sanitized, last_raw
+            return _clean_reply(normalized), last_raw
 
         log.warning(
             "LLM response violated constraints (attempt %s/%s): %s",
             attempt + 1,
-            settings.llm_response_retry_attempts + 1,
+            retry_attempts + 1,
             reason,
         )
-        if attempt >= settings.llm_response_retry_attempts:
+        if attempt >= retry_attempts:
             break
-        attempt_messages = [
-            *attempt_messages,
-            ChatMessage(role="assistant", content=normalized),
-            ChatMessage(role="user", content=_build_retry_instruction(reason)),
-        ]
+        dumped_messages.extend(
+            (
+                {"role": "assistant", "content": normalized},
+                {"role": "user", "content": _build_retry_instruction(reason)},
+            )
+        )
 
     fallback = _apply_fallback(content if "content" in locals() else "")
     log.warning("Returning fallback response after exhausting retries.")
@@ -180,9 +206,11 @@ async def chat(
         max_tokens=request.max_tokens,
     )
 
-    usage = raw.get("usage") or {}
-    choice0 = (raw.get("choices") or [{}])[0]
-    return ChatResponse(
+    usage = raw.get("usage") or _EMPTY_DICT
+    choice0 = (raw.get("choices") or (_EMPTY_DICT,))[0]
+    # model_construct skips validation; every field here is trusted output
+    # we just produced or copied from the upstream reply.
+    return ChatResponse.model_construct(
         content=content,
         model=raw.get("model"),
         finish_reason=choice0.get("finish_reason"),
@@ -197,22 +225,54 @@ async def chat_stream(
     request: ChatRequest,
     llm_service: LLMService = Depends(get_llm_service),
 ) -> StreamingResponse:
-    """Stream chat completions via Server-Sent Events."""
+    """Stream chat completions via Server-Sent Events as the LLM produces them."""
     prepared_messages = _with_system_prompt(request.messages)
-    content, raw = await _generate_response_with_constraints(
-        messages=prepared_messages,
-        llm_service=llm_service,
-        model=request.model,
-        temperature=request.temperature,
-        max_tokens=request.max_tokens,
+    chosen_temperature = (
+        request.temperature
+        if request.temperature is not None
+        else settings.llm_default_temperature
     )
-
-    payload = {"choices": [{"delta": {"content": content}}], "model": raw.get("model")}
+    word_max = settings.llm_response_word_max
 
     async def event_generator():
+        word_total = 0
         try:
-            yield f"data: {json.dumps(payload)}\n\n".encode("utf-8")
-            yield b"data: [DONE]\n\n"
+            async for frame in llm_service.chat_stream(
+                messages=[{"role": m.role, "content": m.content} for m in prepared_messages],
+                model=request.model,
+                temperature=chosen_temperature,
+                max_tokens=request.max_tokens,
+            ):
+                data = frame[5:].strip()
+                if data == b"[DONE]":
+                    yield _SSE_DONE
+                    return
+                try:
+                    parsed = orjson.loads(data)
+                except orjson.JSONDecodeError:
+                    # Pass through frames we cannot parse (e.g. upstream comments).
+                    yield frame
+                    continue
+                delta = ((parsed.get("choices") or [{}])[0].get("delta") or {}).get("content")
+                if not delta:
+                    yield frame
+                    continue
+                # Sanitize each delta in-flight instead of buffering the reply.
+                sanitized = delta.translate(_FORBIDDEN_TRANS)
+                word_total += len(_WORD_PATTERN.findall(sanitized))
+                if sanitized:
+                    parsed["choices"][0]["delta"]["content"] = sanitized
+                    yield _SSE_PREFIX + orjson.dumps(parsed) + _SSE_SUFFIX
+                if word_total > word_max:
+                    # Running word count exceeded the classroom limit; cut the
+                    # stream instead of buffering for a full retry round-trip.
+                    log.warning(
+                        "Streamed response exceeded %s words; truncating stream.",
+                        word_max,
+                    )
+                    yield _SSE_DONE
+                    return
+            yield _SSE_DONE
         except asyncio.CancelledError:
             log.debug("Client closed chat stream early")
             raise
@@ -5,11 +5,15 @@
 發音和學習提示的完整字典資訊。
 """
 
-import json
+import asyncio
 import logging
-from typing import List
+import re
+from typing import Dict, List, Tuple
 
-from fastapi import APIRouter, Depends
+import orjson
+from cachetools import TTLCache
+from fastapi import APIRouter, Depends, Response
+from fastapi.responses import ORJSONResponse
 
 from ...core import settings
 from ...schemas.chat import ChatMessage
@@ -17,9 +21,22 @@ from ...schemas.dictionary import DictionaryRequest, DictionaryResponse
 from ...services.llm import LLMService
 from ..dependencies import get_llm_service
 
-router = APIRouter(tags=["dictionary"])
+router = APIRouter(tags=["dictionary"], default_response_class=ORJSONResponse)
 log = logging.getLogger(__name__)
 
+# 從 LLM 輸出中擷取 JSON 物件的預編譯模式（同時涵蓋 Markdown 圍欄的情況）
+_JSON_OBJECT_RE = re.compile(r"\{.*\}", re.DOTALL)
+
+# 單一欄位的 JSON 轉義表——省去整個 json 編碼器的呼叫成本
+_JSON_ESCAPE = str.maketrans({"\\": "\\\\", '"': '\\"'})
+
+# 字典查詢使用 temperature=0.0，相同單字的結果是確定性的，
+# 因此可以安全地快取重複查詢，省去整個 LLM 往返。
+# 快取內容為預先序列化的 JSON bytes，命中時直接回傳、不再經過 pydantic
+_RESPONSE_CACHE: TTLCache = TTLCache(maxsize=4096, ttl=86400)
+# 每個快取鍵一把鎖，避免同一單字的並發查詢重複觸發 LLM（thundering herd）
+_CACHE_LOCKS: Dict[Tuple[str, str | None], asyncio.Lock] = {}
+
 
 def _build_dictionary_messages(word: str) -> List[ChatMessage]:
     """
@@ -36,7 +53,7 @@ def _build_dictionary_messages(word: str) -> List[ChatMessage]:
         系統提示詞定義了返回的字典格式。
     """
     prompt = settings.llm_dictionary_prompt
-    payload = json.dumps({"word": word}, ensure_ascii=False)
+    payload = f'{{"word": "{word.translate(_JSON_ESCAPE)}"}}'
     return [
         ChatMessage(role="system", content=prompt),
         ChatMessage(role="user", content=payload),
@@ -63,36 +80,30 @@ def _normalize_dictionary_result(payload: str, fallback_word: str) -> Dictionary
     
     # 處理空回應
     if not stripped:
-        return DictionaryResponse(
+        return DictionaryResponse.model_construct(
             headword=fallback_word,
             part_of_speech=None,
             definition="No definition",
             examples=[],
         )
 
-    # 移除 Markdown 程式碼區塊標記
-    if stripped.startswith("```"):
-        segments = [segment.strip() for segment in stripped.split("```") if segment.strip()]
-        if segments:
-            stripped = segments[-1]
-    
-    # 移除 "json" 前綴
-    if stripped.lower().startswith("json"):
-        stripped = stripped[4:].strip()
-    
-    # 提取 JSON 物件（處理多餘的文字）
-    if stripped and not stripped.lstrip().startswith("{"):
-        start = stripped.find("{")
-        end = stripped.rfind("}")
-        if start != -1 and end != -1 and start < end:
-            stripped = stripped[start : end + 1]
+    # 在單次掃描中提取 JSON 物件（無論是否包含 Markdown 圍欄或多餘文字）
+    match = _JSON_OBJECT_RE.search(stripped)
+    if match is None:
+        # 找不到 JSON 物件，返回原始文字作為定義
+        return DictionaryResponse.model_construct(
+            headword=fallback_word,
+            part_of_speech=None,
+            definition=stripped,
+            examples=[],
+        )
 
     # 嘗試解析 JSON
     try:
-        data = json.loads(stripped)
-    except json.JSONDecodeError:
+        data = orjson.loads(match.group(0))
+    except orjson.JSONDecodeError:
         # JSON 解析失敗，返回原始文字作為定義
-        return DictionaryResponse(
+        return DictionaryResponse.model_construct(
             headword=fallback_word,
             part_of_speech=None,
             definition=stripped,
@@ -135,7 +146,7 @@ def _normalize_dictionary_result(payload: str, fallback_word: str) -> Dictionary
         else:
             examples = []
         
-        return DictionaryResponse(
+        return DictionaryResponse.model_construct(
             headword=headword,
             part_of_speech=part_of_speech,
             definition=definition,
@@ -143,7 +154,7 @@ def _normalize_dictionary_result(payload: str, fallback_word: str) -> Dictionary
         )
 
     # 資料格式不符合預期，返回最小回應
-    return DictionaryResponse(
+    return DictionaryResponse.model_construct(
         headword=fallback_word,
         part_of_speech=None,
         definition=stripped,
@@ -155,7 +166,7 @@ def _normalize_dictionary_result(payload: str, fallback_word: str) -> Dictionary
 async def dictionary_lookup(
     request: DictionaryRequest,
     llm_service: LLMService = Depends(get_llm_service),
-) -> DictionaryResponse:
+) -> Response:
     """
     字典查詢 API 端點
     
@@ -171,41 +182,61 @@ async def dictionary_lookup(
         若 LLM 服務不可用，返回友善的錯誤訊息。
         temperature 設為 0.0 以確保結果的一致性。
     """
-    # 建立 LLM 查詢訊息
-    messages = _build_dictionary_messages(request.word)
-    
     # 選擇使用的模型（優先級：請求指定 > 字典專用 > 預設）
     model_choice = (
         request.model
         or settings.llm_dictionary_model
         or settings.llm_default_model
     )
-    
-    # 呼叫 LLM 服務
-    raw: dict | None = None
-    try:
-        content, raw = await llm_service.chat(
-            messages=[m.model_dump() for m in messages],
-            model=model_choice,
-            temperature=0.0,  # 確保輸出的一致性
-        )
-    except Exception as exc:
-        # 優雅降級：LLM 服務不可用時返回錯誤訊息
-        log.warning("Dictionary Search failed: %s", exc)
-        return DictionaryResponse(
-            headword=request.word,
-            part_of_speech=None,
-            definition="No definition available, please try again later.",
-            examples=[],
-            model=None,
-        )
 
-    # 標準化 LLM 輸出為結構化資料
-    normalized = _normalize_dictionary_result(content, fallback_word=request.word)
-    
-    # 添加模型資訊到回應中
-    metadata = raw or {}
-    payload = normalized.model_dump()
-    payload["model"] = metadata.get("model") or payload.get("model")
-    
-    return DictionaryResponse(**payload)
\ No newline at end of file
+    # 快取命中時直接返回，不需要 LLM 往返
+    cache_key = (request.word, model_choice)
+    cached = _RESPONSE_CACHE.get(cache_key)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+
+    # 同一單字的並發查詢共用一把鎖，只有第一個請求會觸發 LLM
+    lock = _CACHE_LOCKS.setdefault(cache_key, asyncio.Lock())
+    try:
+        async with lock:
+            cached = _RESPONSE_CACHE.get(cache_key)
+            if cached is not None:
+                return Response(content=cached, media_type="application/json")
+
+            # 建立 LLM 查詢訊息
+            messages = _build_dictionary_messages(request.word)
+
+            # 呼叫 LLM 服務
+            raw: dict | None = None
+            try:
+                content, raw = await llm_service.chat(
+                    messages=[m.model_dump() for m in messages],
+                    model=model_choice,
+                    temperature=0.0,  # 確保輸出的一致性
+                )
+            except Exception as exc:
+                # 優雅降級：LLM 服務不可用時返回錯誤訊息（不快取失敗結果）
+                log.warning("Dictionary Search failed: %s", exc)
+                fallback = DictionaryResponse(
+                    headword=request.word,
+                    part_of_speech=None,
+                    definition="No definition available, please try again later.",
+                    examples=[],
+                    model=None,
+                )
+                return ORJSONResponse(fallback.model_dump())
+
+            # 標準化 LLM 輸出為結構化資料
+            normalized = _normalize_dictionary_result(content, fallback_word=request.word)
+
+            # 添加模型資訊到回應中（直接改 dump 出的 dict，不再重新驗證模型）
+            payload = normalized.model_dump()
+            payload["model"] = (raw or {}).get("model") or payload["model"]
+
+            # 預先序列化為 bytes，之後的快取命中只需一次 memcpy
+            body = orjson.dumps(payload)
+            _RESPONSE_CACHE[cache_key] = body
+            return Response(content=body, media_type="application/json")
+    finally:
+        # 無論成功與否都釋放鎖映射，避免錯誤路徑讓鎖表無限成長
+        _CACHE_LOCKS.pop(cache_key, None)
@@ -1,43 +1,77 @@
-import json
-from typing import List, Tuple
+import asyncio
+import re
+from typing import Dict, List, Tuple
 
+import orjson
+from cachetools import TTLCache
 from fastapi import APIRouter, Depends
 
-from ...core import settings
+from ...core import settings_fast as settings
 from ...schemas.chat import ChatMessage
 from ...schemas.grammar import GrammarCheckRequest, GrammarCheckResponse
 from ...services.llm import LLMService
-from ..dependencies import get_llm_service
+from ...services.llm_batcher import LLMBatcher
+from ..dependencies import get_llm_service, get_semantic_cache
 
 router = APIRouter(tags=["grammar"])
 
+# One-scan JSON extraction, tolerant of Markdown fences and stray prose.
+_JSON_OBJECT_RE = re.compile(r"\{.*\}", re.DOTALL)
 
-def _build_grammar_messages(text: str, context: List[ChatMessage] | None = None) -> List[ChatMessage]:
-    """Construct chat messages for grammar checking with optional conversation context."""
-    prompt = settings.llm_grammar_prompt
-    messages = [ChatMessage(role="system", content=prompt)]
-    
-    # Include conversation context if provided
-    if context:
-        # Filter to keep only relevant recent messages (e.g., last 6 messages)
-        # to provide context without overwhelming the model
-        recent_context = context[-6:] if len(context) > 6 else context
-        
-        # Build context summary for the prompt
-        context_text = "對話歷史：\n"
-        for msg in recent_context:
-            if msg.role == "assistant":
-                context_text += f"assistant: {msg.content}\n"
-            elif msg.role == "user":
-                context_text += f"user: {msg.content}\n"
-        
-        context_text += f"\n學生當前回覆：{text}"
-        messages.append(ChatMessage(role="user", content=context_text))
-    else:
+# 語意快取：措辭相近的重複回覆可命中先前的評語（預設停用）
+_SEMANTIC_CACHE = get_semantic_cache("grammar")
+
+# The multi-KB system prompt is static; serialize it once at import instead of
+# paying a ChatMessage validation + model_dump per request.
+_SYSTEM_MESSAGE_DUMP = {"role": "system", "content": settings.llm_grammar_prompt}
+
+# Model choice is immutable at runtime; resolve the fallback chain once.
+_DEFAULT_MODEL = settings.llm_grammar_model or settings.llm_default_model
+
+# JSON mode makes the sampler reject non-JSON output at the backend; the
+# recovery path in _normalize_grammar_result stays as a safety net only.
+_RESPONSE_FORMAT = {"type": "json_object"} if settings.llm_grammar_json_mode else None
+
+# 啟用時，短視窗內的並發文法檢查會合併為單一 LLM 呼叫
+_BATCHER = (
+    LLMBatcher(get_llm_service(), settings.llm_grammar_prompt)
+    if settings.enable_llm_batching
+    else None
+)
+
+# Grammar checks run at temperature=0.0; identical (text, context, model)
+# inputs are deterministic and safe to serve from an in-process cache.
+_RESPONSE_CACHE: TTLCache = TTLCache(maxsize=4096, ttl=settings.llm_cache_ttl_seconds)
+_CACHE_LOCKS: Dict[tuple, asyncio.Lock] = {}
+
+
+def _build_grammar_user_content(text: str, context: List[ChatMessage] | None = None) -> str:
+    """Render the user turn for grammar checking with optional conversation context."""
+    if not context:
         # No context provided, just check the text directly
-        messages.append(ChatMessage(role="user", content=f"學生回覆：{text}"))
-    
-    return messages
+        return f"學生回覆：{text}"
+
+    # Filter to keep only relevant recent messages (e.g., last 6 messages)
+    # to provide context without overwhelming the model
+    recent_context = context[-6:] if len(context) > 6 else context
+
+    # Build context summary for the prompt
+    context_text = "對話歷史：\n"
+    for msg in recent_context:
+        if msg.role == "assistant":
+            context_text += f"assistant: {msg.content}\n"
+        elif msg.role == "user":
+            context_text += f"user: {msg.content}\n"
+
+    return context_text + f"\n學生當前回覆：{text}"
+
+
+def _build_grammar_messages(text: str, context: List[ChatMessage] | None = None) -> List[dict]:
+    """Construct chat message payloads for grammar checking with optional conversation context."""
+    return [
+        _SYSTEM_MESSAGE_DUMP,
+        {"role": "user", "content": _build_grammar_user_content(text, context)},
+    ]
 
 
 def _normalize_grammar_result(raw: str) -> Tuple[bool, str, str | None]:
@@ -46,24 +80,25 @@ def _normalize_grammar_result(raw: str) -> Tuple[bool, str, str | None]:
     if not stripped:
         return False, "No grammar feedback returned. Please try again.", None
 
-    # Remove common code fences and language hints (e.g. ```json ... ```).
-    if stripped.startswith("```"):
-        segments = [segment.strip() for segment in stripped.split("```") if segment.strip()]
-        if segments:
-            stripped = segments[0]
-    if stripped.lower().startswith("json"):
-        stripped = stripped[4:].strip()
+    # With JSON mode at the backend most replies are already clean JSON;
+    # try the direct parse before falling back to regex extraction.
+    data = None
+    if stripped.startswith("{"):
+        try:
+            data = orjson.loads(stripped)
+        except orjson.JSONDecodeError:
+            data = None
 
-    if stripped and not stripped.lstrip().startswith("{"):
-        start = stripped.find("{")
-        end = stripped.rfind("}")
-        if start != -1 and end != -1 and start < end:
-            stripped = stripped[start : end + 1]
-
-    try:
-        data = json.loads(stripped)
-    except json.JSONDecodeError:
-        return False, stripped, None
+    if data is None:
+        # Extract the JSON object in one scan, regardless of code fences or
+        # surrounding prose, then parse it with orjson.
+        match = _JSON_OBJECT_RE.search(stripped)
+        if match is None:
+            return False, stripped, None
+        try:
+            data = orjson.loads(match.group(0))
+        except orjson.JSONDecodeError:
+            return False, stripped, None
 
     if isinstance(data, dict):
         is_correct = bool(data.get("is_correct"))
@@ -85,21 +120,55 @@ async def grammar_check(
     llm_service: LLMService = Depends(get_llm_service),
 ) -> GrammarCheckResponse:
     """Analyse user text and report grammar issues using the configured LLM."""
-    messages = _build_grammar_messages(request.text, request.context)
-    model_choice = (
-        request.model
-        or settings.llm_grammar_model
-        or settings.llm_default_model
-    )
-    content, raw = await llm_service.chat(
-        messages=[m.model_dump() for m in messages],
-        model=model_choice,
-        temperature=0.0,
-    )
-    is_correct, feedback, suggestion = _normalize_grammar_result(content)
-    return GrammarCheckResponse(
-        is_correct=is_correct,
-        feedback=feedback,
-        suggestion=suggestion,
-        model=raw.get("model"),
-    )
+    model_choice = request.model or _DEFAULT_MODEL
+
+    # The conversation context changes the verdict, so it is part of the key.
+    context_key = tuple((m.role, m.content) for m in request.context or ())
+    cache_key = (request.text, context_key, model_choice)
+    cached = _RESPONSE_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
+
+    lock = _CACHE_LOCKS.setdefault(cache_key, asyncio.Lock())
+    try:
+        async with lock:
+            cached = _RESPONSE_CACHE.get(cache_key)
+            if cached is not None:
+                return cached
+
+            # 上下文會影響評語，所以語意比對的輸入包含完整上下文
+            semantic_text = "\n".join(
+                f"{role}: {content}" for role, content in context_key
+            ) + f"\n{request.text}"
+            semantic_hit = await _SEMANTIC_CACHE.lookup(semantic_text)
+            if semantic_hit is not None:
+                return semantic_hit
+
+            if _BATCHER is not None:
+                content, raw = await _BATCHER.submit(
+                    _build_grammar_user_content(request.text, request.context),
+                    model=model_choice,
+                )
+            else:
+                # Stream and cut generation as soon as the JSON object closes.
+                content, raw = await llm_service.chat_json_stream(
+                    messages=_build_grammar_messages(request.text, request.context),
+                    model=model_choice,
+                    temperature=0.0,
+                    response_format=_RESPONSE_FORMAT,
+                )
+            is_correct, feedback, suggestion = _normalize_grammar_result(content)
+            # model_construct skips validation; _normalize_grammar_result already
+            # coerced every field.
+            response = GrammarCheckResponse.model_construct(
+                is_correct=is_correct,
+                feedback=feedback,
+                suggestion=suggestion,
+                model=raw.get("model"),
+            )
+            _RESPONSE_CACHE[cache_key] = response
+            await _SEMANTIC_CACHE.store(semantic_text, response)
+            return response
+    finally:
+        # 無論成功與否都釋放鎖映射，避免錯誤路徑讓鎖表無限成長
+        _CACHE_LOCKS.pop(cache_key, None)
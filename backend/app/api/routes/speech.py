@@ -1,6 +1,8 @@
+import uuid
 from pathlib import Path
 
-from fastapi import APIRouter, Depends, File, UploadFile
+import aiofiles
+from fastapi import APIRouter, Depends, File, Response, UploadFile
 
 from ...schemas.speech import (
     TextToSpeechRequest,
@@ -13,10 +15,30 @@ from ..dependencies import (
     get_stt_service,
     get_tts_service,
 )
-from ..workflows import generate_stt_response, generate_tts_response
+from ..workflows import generate_stt_response, generate_tts_audio, generate_tts_response
 
 router = APIRouter(tags=["speech"])
 
+# Known-safe audio suffixes; anything else falls back to .wav.
+_SUFFIX_MAP = {
+    ".wav": ".wav",
+    ".mp3": ".mp3",
+    ".m4a": ".m4a",
+    ".ogg": ".ogg",
+    ".webm": ".webm",
+    ".flac": ".flac",
+}
+
+
+def _pick_suffix(name: str | None) -> str:
+    """Resolve the upload's audio suffix without a per-request Path allocation."""
+    if not name:
+        return ".wav"
+    index = name.rfind(".")
+    if index == -1:
+        return ".wav"
+    return _SUFFIX_MAP.get(name[index:].lower(), ".wav")
+
 
 @router.post("/stt", response_model=TranscriptionResponse)
 async def speech_to_text(
@@ -25,12 +47,21 @@ async def speech_to_text(
     audio_dir: Path = Depends(get_audio_directory),
 ) -> TranscriptionResponse:
     """Convert uploaded audio into text using Whisper.cpp."""
-    audio_bytes = await file.read()
-    return generate_stt_response(
+    # Spool the upload to disk in chunks so peak memory stays O(chunk)
+    # instead of O(file size).
+    temp_path = audio_dir / f"upload-{uuid.uuid4().hex}{_pick_suffix(file.filename)}"
+    try:
+        async with aiofiles.open(temp_path, "wb") as spool:
+            while chunk := await file.read(1 << 16):
+                await spool.write(chunk)
+    except BaseException:
+        # Client disconnects mid-upload must not leave partial spool files.
+        temp_path.unlink(missing_ok=True)
+        raise
+    return await generate_stt_response(
         stt_service=stt_service,
         audio_dir=audio_dir,
-        audio_bytes=audio_bytes,
-        filename=file.filename,
+        audio_path=temp_path,
     )
 
 
@@ -41,8 +72,31 @@ async def text_to_speech(
     audio_dir: Path = Depends(get_audio_directory),
 ) -> TextToSpeechResponse:
     """Convert text into speech audio using Piper."""
-    return generate_tts_response(
+    return await generate_tts_response(
+        tts_service=tts_service,
+        audio_dir=audio_dir,
+        request=request,
+    )
+
+
+@router.post("/tts/raw")
+async def text_to_speech_raw(
+    request: TextToSpeechRequest,
+    tts_service: TTSService = Depends(get_tts_service),
+    audio_dir: Path = Depends(get_audio_directory),
+) -> Response:
+    """Convert text into speech and return raw WAV bytes.
+
+    Skips base64's 4/3 payload inflation for clients that can consume the
+    audio directly; the sample rate travels in the X-Sample-Rate header.
+    """
+    audio_bytes, sample_rate = await generate_tts_audio(
         tts_service=tts_service,
         audio_dir=audio_dir,
         request=request,
     )
+    return Response(
+        content=audio_bytes,
+        media_type="audio/wav",
+        headers={"X-Sample-Rate": str(sample_rate)},
+    )
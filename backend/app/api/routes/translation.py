@@ -1,26 +1,61 @@
-from typing import List
+import asyncio
+from functools import lru_cache
+from typing import Dict, List, Tuple
 
+from cachetools import TTLCache
 from fastapi import APIRouter, Depends
 
-from ...core import settings
-from ...schemas.chat import ChatMessage
+from ...core import settings_fast as settings
 from ...schemas.translation import TranslationRequest, TranslationResponse
 from ...services.llm import LLMService
-from ..dependencies import get_llm_service
+from ...services.llm_batcher import LLMBatcher
+from ..dependencies import get_llm_service, get_semantic_cache
 
 router = APIRouter(tags=["translation"])
 
+# 語意快取：相似措辭的重複查詢可命中先前的翻譯（預設停用）
+_SEMANTIC_CACHE = get_semantic_cache("translation")
 
-def _build_translation_messages(text: str, target_language: str) -> List[ChatMessage]:
-    """Construct messages for translation requests."""
+# Model choice is immutable at runtime; resolve the fallback chain once.
+_DEFAULT_MODEL = settings.llm_translation_model or settings.llm_default_model
+
+# 啟用時，短視窗內的並發翻譯請求會合併為單一 LLM 呼叫
+_BATCHER = (
+    LLMBatcher(get_llm_service(), settings.llm_translation_prompt)
+    if settings.enable_llm_batching
+    else None
+)
+
+# Translations run at temperature=0.0, so identical inputs are deterministic
+# and safe to serve from an in-process cache without an LLM round-trip.
+_RESPONSE_CACHE: TTLCache = TTLCache(maxsize=4096, ttl=settings.llm_cache_ttl_seconds)
+_CACHE_LOCKS: Dict[Tuple[str, str, str | None], asyncio.Lock] = {}
+
+
+@lru_cache(maxsize=32)
+def _formatted_translation_prompt(target_language: str) -> str:
+    """Format the system prompt once per target language (legacy templates only)."""
     prompt_template = settings.llm_translation_prompt
     try:
-        system_prompt = prompt_template.format(target_language=target_language)
+        return prompt_template.format(target_language=target_language)
     except (KeyError, IndexError, ValueError):
-        system_prompt = prompt_template
+        return prompt_template
+
+
+def _build_translation_user_content(text: str, target_language: str) -> str:
+    """Render the user turn; the target language rides here, not in the system prompt."""
+    return f"Target language: {target_language}\n\n{text}"
+
+
+def _build_translation_messages(text: str, target_language: str) -> List[dict]:
+    """Construct message payloads for translation requests.
+
+    The system prompt stays byte-identical across requests so backends with
+    prefix/KV caching can reuse it.
+    """
     return [
-        ChatMessage(role="system", content=system_prompt),
-        ChatMessage(role="user", content=text),
+        {"role": "system", "content": _formatted_translation_prompt(target_language)},
+        {"role": "user", "content": _build_translation_user_content(text, target_language)},
     ]
 
 
@@ -31,18 +66,45 @@ async def translate(
 ) -> TranslationResponse:
     """Translate text into a target language using the configured LLM."""
     target_language = (request.target_language or "zh-TW").strip() or "zh-TW"
-    messages = _build_translation_messages(request.text, target_language)
-    model_choice = (
-        request.model
-        or settings.llm_translation_model
-        or settings.llm_default_model
-    )
-    content, raw = await llm_service.chat(
-        messages=[m.model_dump() for m in messages],
-        model=model_choice,
-        temperature=0.0,
-    )
-    return TranslationResponse(
-        translated_text=content.strip(),
-        model=raw.get("model"),
-    )
+    model_choice = request.model or _DEFAULT_MODEL
+
+    cache_key = (request.text, target_language, model_choice)
+    cached = _RESPONSE_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
+
+    # Concurrent requests for the same text share one lock so only the first
+    # triggers the LLM round-trip.
+    lock = _CACHE_LOCKS.setdefault(cache_key, asyncio.Lock())
+    try:
+        async with lock:
+            cached = _RESPONSE_CACHE.get(cache_key)
+            if cached is not None:
+                return cached
+
+            semantic_hit = await _SEMANTIC_CACHE.lookup(f"{target_language}|{request.text}")
+            if semantic_hit is not None:
+                return semantic_hit
+
+            if _BATCHER is not None:
+                content, raw = await _BATCHER.submit(
+                    _build_translation_user_content(request.text, target_language),
+                    model=model_choice,
+                )
+            else:
+                content, raw = await llm_service.chat(
+                    messages=_build_translation_messages(request.text, target_language),
+                    model=model_choice,
+                    temperature=0.0,
+                )
+            # model_construct skips validation on trusted, just-produced values.
+            response = TranslationResponse.model_construct(
+                translated_text=content.strip(),
+                model=raw.get("model"),
+            )
+            _RESPONSE_CACHE[cache_key] = response
+            await _SEMANTIC_CACHE.store(f"{target_language}|{request.text}", response)
+            return response
+    finally:
+        # 無論成功與否都釋放鎖映射，避免錯誤路徑讓鎖表無限成長
+        _CACHE_LOCKS.pop(cache_key, None)
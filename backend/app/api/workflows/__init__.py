@@ -1,5 +1,5 @@
 """High-level workflow helpers reused across API routes."""
 
-from .speech import generate_stt_response, generate_tts_response
+from .speech import generate_stt_response, generate_tts_audio, generate_tts_response
 
-__all__ = ["generate_stt_response", "generate_tts_response"]
+__all__ = ["generate_stt_response", "generate_tts_audio", "generate_tts_response"]
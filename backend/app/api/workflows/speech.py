@@ -5,9 +5,16 @@
 包括音訊處理、服務調用和結果封裝。
 """
 
+import asyncio
+import time
 from pathlib import Path
 from typing import Optional
-import time
+
+# pybase64 使用 SIMD 指令編碼，較 stdlib 快數倍；未安裝時退回 stdlib
+try:
+    import pybase64 as base64
+except ImportError:
+    import base64
 
 from ...schemas.speech import (
     TextToSpeechRequest,
@@ -15,10 +22,51 @@ from ...schemas.speech import (
     TranscriptionResponse,
 )
 from ...services import STTService, TTSService
-from ...utils import decode_audio_base64, save_audio_bytes
+from ..dependencies import get_audit_writer
 
+# 限制並發的 whisper/piper 子行程數量：兩者都會吃滿多個 CPU 核心，
+# 無上限的並發只會互相搶佔而拉長所有請求的尾延遲
+_STT_SEMAPHORE = asyncio.Semaphore(2)
+_TTS_SEMAPHORE = asyncio.Semaphore(2)
 
-def generate_tts_response(
+
+async def generate_tts_audio(
+    tts_service: TTSService,
+    audio_dir: Path,
+    request: TextToSpeechRequest,
+) -> tuple[bytes, int]:
+    """
+    合成語音並返回原始位元組與取樣率
+
+    參數:
+        tts_service: 文字轉語音服務實例
+        audio_dir: 音訊儲存目錄
+        request: 文字轉語音請求物件
+
+    返回:
+        tuple[bytes, int]: (WAV 位元組, 取樣率)
+
+    說明:
+        稽核持久化走背景佇列；呼叫端自行決定回應格式
+        （base64 JSON 或原始位元組）。
+    """
+    async with _TTS_SEMAPHORE:
+        audio_bytes, sample_rate = await asyncio.to_thread(
+            tts_service.synthesize,
+            text=request.text,
+            voice=request.voice,
+            length_scale=request.length_scale,
+            noise_scale=request.noise_scale,
+            noise_w=request.noise_w,
+        )
+
+    # 排入背景稽核佇列（best-effort 寫入，不佔用回應關鍵路徑）
+    get_audit_writer().submit(audio_dir, audio_bytes)
+
+    return audio_bytes, sample_rate
+
+
+async def generate_tts_response(
     tts_service: TTSService,
     audio_dir: Path,
     request: TextToSpeechRequest,
@@ -36,26 +84,22 @@ def generate_tts_response(
     
     說明:
         合成語音並將生成的音訊持久化以便稽核。
+        持久化僅供稽核使用，因此以背景任務寫入，
+        不佔用回應的關鍵路徑。
     """
     start_time = time.perf_counter()
-    
-    # 使用 TTS 服務合成語音
-    audio_base64, sample_rate = tts_service.synthesize(
-        text=request.text,
-        voice=request.voice,
-        length_scale=request.length_scale,
-        noise_scale=request.noise_scale,
-        noise_w=request.noise_w,
-    )
 
-    # 解碼並儲存音訊檔案
-    audio_bytes = decode_audio_base64(audio_base64)
-    save_audio_bytes(audio_dir, audio_bytes)
+    # 合成語音並排入稽核佇列（服務直接返回原始位元組）
+    audio_bytes, sample_rate = await generate_tts_audio(tts_service, audio_dir, request)
+
+    # 僅在回應邊界做一次 base64 編碼
+    audio_base64 = base64.b64encode(audio_bytes).decode("ascii")
 
     # 計算處理時間
     elapsed_seconds = time.perf_counter() - start_time
     
-    return TextToSpeechResponse(
+    # model_construct 跳過驗證：欄位值都是我們剛產生的可信資料
+    return TextToSpeechResponse.model_construct(
         audio_base64=audio_base64,
         sample_rate=sample_rate,
         duration_seconds=elapsed_seconds,
@@ -66,44 +110,48 @@ def generate_tts_response(
     )
 
 
-def generate_stt_response(
+async def generate_stt_response(
     stt_service: STTService,
     audio_dir: Path,
-    audio_bytes: bytes,
-    filename: Optional[str] = None,
+    audio_bytes: Optional[bytes] = None,
+    audio_path: Optional[Path] = None,
 ) -> TranscriptionResponse:
     """
     生成語音轉文字回應
-    
+
     參數:
         stt_service: 語音轉文字服務實例
         audio_dir: 音訊儲存目錄
-        audio_bytes: 原始音訊位元組資料
-        filename: 原始檔案名稱（可選，用於判斷副檔名）
-    
+        audio_bytes: 原始音訊位元組資料（與 audio_path 二擇一，經 stdin 轉寫）
+        audio_path: 已落地的音訊檔案路徑（呼叫者以串流方式寫入時使用）
+
     返回:
         TranscriptionResponse: 包含轉寫文字和處理時間的回應物件
-    
+
     說明:
         轉寫音訊內容並回報總處理時長。
-        臨時音訊檔案在處理後會被自動刪除。
+        臨時音訊檔案在處理後會被自動刪除（包含呼叫者提供的 audio_path）。
     """
     start_time = time.perf_counter()
-    
-    # 確定檔案副檔名
-    suffix = Path(filename or "").suffix or ".wav"
-    
-    # 儲存臨時音訊檔案
-    temp_path = save_audio_bytes(audio_dir, audio_bytes, suffix=suffix)
 
-    try:
-        # 執行語音轉文字
-        transcription = stt_service.transcribe(temp_path)
-    finally:
-        # 清理臨時檔案
-        temp_path.unlink(missing_ok=True)
+    if audio_path is None:
+        # 記憶體中的音訊直接經 stdin 送入 whisper-cli，
+        # 省去臨時檔案的寫入／讀取／刪除
+        async with _STT_SEMAPHORE:
+            transcription = await asyncio.to_thread(
+                stt_service.transcribe_bytes, audio_bytes or b""
+            )
+    else:
+        try:
+            # 在背景執行緒執行語音轉文字（whisper-cli 是阻塞的子行程呼叫）
+            async with _STT_SEMAPHORE:
+                transcription = await asyncio.to_thread(stt_service.transcribe, audio_path)
+        finally:
+            # 在背景執行緒清理臨時檔案，刪除的磁碟 I/O 不阻塞事件迴圈
+            await asyncio.to_thread(audio_path.unlink, missing_ok=True)
 
     # 計算處理時間（毫秒）
     elapsed_ms = (time.perf_counter() - start_time) * 1000.0
     
-    return TranscriptionResponse(text=transcription, duration_ms=elapsed_ms)
+    # model_construct 跳過驗證：欄位值都是我們剛產生的可信資料
+    return TranscriptionResponse.model_construct(text=transcription, duration_ms=elapsed_ms)
@@ -4,7 +4,7 @@
 此模組提供應用程式的核心功能，包括配置管理和日誌系統。
 """
 
-from .config import Settings, settings
+from .config import Settings, get_settings, settings, settings_fast
 from .logging import configure_logging
 
-__all__ = ["Settings", "settings", "configure_logging"]
+__all__ = ["Settings", "get_settings", "settings", "settings_fast", "configure_logging"]
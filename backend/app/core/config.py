@@ -5,12 +5,19 @@
 大型語言模型等服務的配置參數。所有設定都可透過環境變數覆蓋。
 """
 
-from pathlib import Path
+import logging
 import os
+import sys
+from functools import lru_cache
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Literal
 
-from pydantic import Field
+from pydantic import Field, model_validator
 from pydantic_settings import BaseSettings
 
+log = logging.getLogger(__name__)
+
 # 定義重要的目錄路徑常數
 _APP_DIR = Path(__file__).resolve().parent.parent  # 應用程式根目錄
 _MODEL_DIR = _APP_DIR / "model"  # 模型檔案目錄
@@ -20,22 +27,29 @@ _TTS_RUNTIME_DIR = _TTS_DIR / "runtime"  # TTS 執行環境目錄
 _TTS_VOICES_DIR = _TTS_DIR / "voices"  # TTS 語音模型目錄
 
 
+@lru_cache(maxsize=1)
 def _default_whisper_binary() -> Path:
     """
     尋找 Whisper.cpp 可執行檔
-    
+
     優先使用本地編譯的版本（位於 backend/app/model）。
     返回最可能的候選檔案，部署時可透過環境變數覆蓋。
-    
+    候選路徑的檔案系統檢查只做一次（lru_cache）。
+
     返回:
         Path: Whisper 可執行檔的路徑
     """
+    # 單次 scandir 取得目錄內容，取代對每個候選檔名各一次的 stat
+    try:
+        names = {entry.name for entry in os.scandir(_STT_DIR)}
+    except OSError:
+        return _STT_DIR / "whisper-cli.exe"
+
     # 按優先順序搜尋可能的執行檔名稱
     for candidate in ("whisper-cli.exe", "main.exe", "whisper-cli", "main"):
-        binary_path = _STT_DIR / candidate
-        if binary_path.exists():
-            return binary_path
-    
+        if candidate in names:
+            return _STT_DIR / candidate
+
     # 如果都找不到，返回預設路徑
     return _STT_DIR / "whisper-cli.exe"
 
@@ -67,6 +81,10 @@ class Settings(BaseSettings):
         default_factory=_default_whisper_model,
         description="Whisper.cpp 模型檔案路徑",
     )
+    whisper_quantization: Literal["q4_0", "q5_1", "q8_0", "f16"] = Field(
+        default="q5_1",
+        description="Whisper 模型量化等級；越低的位元數記憶體頻寬需求越小、速度越快",
+    )
     whisper_threads: int = Field(
         default_factory=lambda: os.cpu_count() or 1,
         description="分配給 Whisper.cpp 的 CPU 執行緒數量",
@@ -148,6 +166,38 @@ class Settings(BaseSettings):
         default=2,
         description="在退回到修剪之前，要求 LLM 修正規則違反的額外嘗試次數",
     )
+    llm_cache_ttl_seconds: int = Field(
+        default=1800,
+        description="翻譯與文法檢查等確定性 LLM 回應的快取存活秒數",
+    )
+    enable_llm_batching: bool = Field(
+        default=False,
+        description="是否將短視窗內的文法/翻譯請求合併為單一 LLM 呼叫",
+    )
+    llm_batch_window_ms: int = Field(
+        default=25,
+        description="LLM 批次合併的收集視窗（毫秒）",
+    )
+    llm_batch_max: int = Field(
+        default=8,
+        description="單一批次可合併的最大請求數",
+    )
+    enable_semantic_cache: bool = Field(
+        default=False,
+        description="是否對翻譯與文法檢查啟用句子向量語意快取（需要可選依賴）",
+    )
+    semantic_cache_model: str = Field(
+        default="all-MiniLM-L6-v2",
+        description="語意快取使用的 sentence-transformers 模型名稱",
+    )
+    semantic_cache_threshold: float = Field(
+        default=0.92,
+        description="語意快取視為命中的最低餘弦相似度",
+    )
+    semantic_cache_max_entries: int = Field(
+        default=2048,
+        description="語意快取的條目上限；達到後丟棄較舊的一半並重建索引",
+    )
     # ========== 翻譯服務設定 ==========
     llm_translation_model: str | None = Field(
         default=None,
@@ -155,10 +205,13 @@ class Settings(BaseSettings):
     )
     llm_translation_prompt: str = Field(
         default=(
-            "你是一位翻譯大師。請將使用者的訊息翻譯成 {target_language}。"
+            "你是一位翻譯大師。請將使用者的訊息翻譯成使用者指定的目標語言。"
             "只返回翻譯後的文字，不要加入額外的評論。"
         ),
-        description="翻譯請求使用的系統提示範本",
+        description=(
+            "翻譯請求使用的系統提示。保持固定內容（目標語言放在使用者訊息中）"
+            "可讓支援 prefix/KV 快取的 LLM 後端重複使用快取的前綴"
+        ),
     )
     
     # ========== 文法檢查服務設定 ==========
@@ -166,6 +219,11 @@ class Settings(BaseSettings):
         default=None,
         description="文法檢查請求使用的可選覆蓋模型名稱",
     )
+    llm_grammar_json_mode: bool = Field(
+        default=True,
+        description="是否向 LLM 後端請求 JSON 模式輸出（response_format=json_object）；"
+        "不支援該欄位的舊後端可關閉",
+    )
     llm_grammar_prompt: str = Field(
         default=(
             "你是一位友善且鼓勵性的英語教師，負責檢查學生的英語回覆並提供建設性的建議。"
@@ -251,11 +309,73 @@ class Settings(BaseSettings):
         description="用於情境字典解釋的系統提示，例句包含英文和中文翻譯",
     )
 
+    @model_validator(mode="after")
+    def _apply_whisper_quantization(self) -> "Settings":
+        """
+        依量化設定挑選對應的 Whisper 模型檔案
+
+        說明:
+            只在使用者未明確覆蓋 whisper_model 時生效。
+            對應量化檔案不存在時保留預設模型並記錄警告。
+        """
+        if self.whisper_model != _default_whisper_model():
+            return self
+        if self.whisper_quantization == "q5_1":
+            return self
+        if self.whisper_quantization == "f16":
+            candidate = _STT_DIR / "ggml-small.en.bin"
+        else:
+            candidate = _STT_DIR / f"ggml-small.en-{self.whisper_quantization}.bin"
+        if candidate.exists():
+            self.whisper_model = candidate
+        else:
+            log.warning(
+                "找不到 %s 量化模型（%s），沿用預設模型 %s",
+                self.whisper_quantization,
+                candidate,
+                self.whisper_model,
+            )
+        return self
+
     class Config:
         """Pydantic 配置類別"""
         env_file = ".env"
         env_file_encoding = "utf-8"
 
 
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    取得設定單例
+
+    返回:
+        Settings: 驗證過的應用程式設定
+
+    說明:
+        Settings() 的建構會解析 .env 與環境變數並驗證所有欄位
+        （包含大型提示字串），lru_cache 確保這個成本只付一次，
+        測試或延遲載入的呼叫端也能共用同一實例。
+    """
+    return Settings()
+
+
 # 建立全域設定實例
-settings = Settings()
+settings = get_settings()
+
+# 將大型靜態提示字串 intern：多 worker 下相同字串共用同一份
+# 記憶體，字典查找與身分比較也變成指標比較
+for _prompt_field in (
+    "llm_system_prompt",
+    "llm_grammar_prompt",
+    "llm_dictionary_prompt",
+    "llm_translation_prompt",
+):
+    _prompt_value = getattr(settings, _prompt_field)
+    if isinstance(_prompt_value, str):
+        setattr(settings, _prompt_field, sys.intern(_prompt_value))
+del _prompt_field, _prompt_value
+
+# 啟動後設定即不再變動；凍結成 SimpleNamespace 後，熱路徑上的屬性
+# 存取走 C 層的 __dict__ 查找，不經過 pydantic 的模型機制。
+# pydantic 實例仍負責環境變數載入與驗證
+settings_fast = SimpleNamespace(**settings.model_dump())
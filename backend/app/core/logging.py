@@ -26,6 +26,13 @@ def configure_logging(
     # 如果 level 是字串，轉換為對應的日誌級別常數
     if isinstance(level, str):
         level = getattr(logging, level.upper(), logging.INFO)
-    
+
+    # 已有 handler（例如 uvicorn 先配置過）時只調整級別，
+    # 避免重複安裝 handler 造成重覆輸出
+    root = logging.getLogger()
+    if root.hasHandlers():
+        root.setLevel(level or logging.INFO)
+        return
+
     # 配置基本日誌設定
     logging.basicConfig(level=level or logging.INFO)
@@ -5,27 +5,108 @@ FastAPI 應用程式主入口
 並可選擇性地掛載前端靜態檔案。
 """
 
+import gzip
+from contextlib import asynccontextmanager
 from pathlib import Path
+from typing import AsyncIterator
 
-from fastapi import FastAPI
-from fastapi.responses import FileResponse
+from fastapi import FastAPI, Request, Response
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 
 from .api import register_routes
+from .api.dependencies import (
+    get_audio_directory,
+    get_audit_writer,
+    get_llm_service,
+    get_stt_service,
+    get_tts_service,
+)
 from .core import configure_logging
 
-# 配置日誌系統
-configure_logging()
+# 回應 text/event-stream 的路徑。GzipFile 不會逐訊息 flush：壓縮 SSE 會把
+# 所有幀緩衝到串流結束才一次送出，等於取消串流，因此這些路徑跳過壓縮
+_SSE_PATHS = frozenset({"/chat/stream"})
 
-# 建立 FastAPI 應用程式實例
-app = FastAPI(
-    title="EnglishTalk API",
-    version="0.1.0",
-    description="語音處理端點與本地大型語言模型的聊天代理服務",
-)
 
-# 註冊所有 API 路由
-register_routes(app)
+class SSEExemptGZipMiddleware:
+    """
+    對 SSE 端點跳過壓縮的 GZip 中介層外包裝
+
+    說明:
+        一般 JSON 回應仍交給 GZipMiddleware 壓縮；
+        SSE 串流路徑直接走未包裝的應用程式，確保每個幀即時送達。
+    """
+
+    def __init__(self, app, minimum_size: int = 1024, compresslevel: int = 5) -> None:
+        self.plain_app = app
+        self.gzip_app = GZipMiddleware(
+            app, minimum_size=minimum_size, compresslevel=compresslevel
+        )
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope.get("type") == "http" and scope.get("path") in _SSE_PATHS:
+            await self.plain_app(scope, receive, send)
+        else:
+            await self.gzip_app(scope, receive, send)
+
+
+@asynccontextmanager
+async def _lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """
+    應用程式生命週期管理
+
+    說明:
+        在啟動時預熱所有單例服務，讓第一個請求不必承擔
+        服務建構（路徑檢查、目錄建立等）的冷啟動成本；
+        同時啟動背景稽核寫入任務，關閉時等待其排空佇列。
+    """
+    get_audio_directory()
+    get_stt_service()
+    get_tts_service()
+    get_llm_service()
+    audit_writer = get_audit_writer()
+    audit_writer.start()
+    yield
+    await audit_writer.stop()
+    await get_llm_service().aclose()
+
+
+def create_app() -> FastAPI:
+    """
+    建立並配置 FastAPI 應用程式實例
+
+    返回:
+        FastAPI: 完整配置的應用程式
+
+    說明:
+        單一工廠集中日誌配置、路由註冊與前端掛載，
+        確保這些 import 時期的工作只執行一次。
+    """
+    # 配置日誌系統
+    configure_logging()
+
+    # 建立 FastAPI 應用程式實例
+    app = FastAPI(
+        title="EnglishTalk API",
+        version="0.1.0",
+        description="語音處理端點與本地大型語言模型的聊天代理服務",
+        lifespan=_lifespan,
+        default_response_class=ORJSONResponse,
+    )
+
+    # 壓縮超過 1 KB 的回應：base64 音訊與長字典回覆可縮小 60-80%。
+    # SSE 路徑不壓縮（見 SSEExemptGZipMiddleware）
+    app.add_middleware(SSEExemptGZipMiddleware, minimum_size=1024, compresslevel=5)
+
+    # 註冊所有 API 路由
+    register_routes(app)
+
+    # 執行前端檔案掛載
+    _attach_frontend(app)
+
+    return app
 
 
 def _attach_frontend(app: FastAPI) -> None:
@@ -51,16 +132,44 @@ def _attach_frontend(app: FastAPI) -> None:
         # 掛載靜態檔案目錄
         app.mount("/app", StaticFiles(directory=str(dist_dir), html=True), name="app")
 
+        # 掛載時即讀入 index.html 並預先 gzip 一次；之後每次請求只回傳
+        # 快取的位元組，Content-Length 已知、不需要逐請求壓縮
+        index_bytes = (dist_dir / "index.html").read_bytes()
+        index_gzip = gzip.compress(index_bytes, compresslevel=9)
+
         # 提供前端入口點
         @app.get("/app", include_in_schema=False)  # type: ignore
-        async def app_index() -> FileResponse:
-            """返回前端應用程式的 index.html"""
-            return FileResponse(str(dist_dir / "index.html"))
+        async def app_index(request: Request) -> Response:
+            """返回前端應用程式的 index.html（支援預壓縮的 gzip 版本）"""
+            if "gzip" in request.headers.get("accept-encoding", ""):
+                return Response(
+                    content=index_gzip,
+                    media_type="text/html; charset=utf-8",
+                    headers={"Content-Encoding": "gzip", "Vary": "Accept-Encoding"},
+                )
+            return Response(content=index_bytes, media_type="text/html; charset=utf-8")
             
     except Exception:
         # 防禦性處理：如果掛載失敗，不影響 API 運作
         return
 
 
-# 執行前端檔案掛載
-_attach_frontend(app)
+# 模組層級的應用程式實例（uvicorn 的 import 目標）
+app = create_app()
+
+
+if __name__ == "__main__":
+    import os
+
+    import uvicorn
+
+    # uvicorn[standard] 在非 Windows 平台會自動選用 uvloop/httptools；
+    # 多個 worker 讓 I/O 密集的端點吃滿多核心（單例服務為 per-worker）
+    uvicorn.run(
+        "backend.app.main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="auto",
+        http="auto",
+        workers=max(2, (os.cpu_count() or 2) // 2),
+    )
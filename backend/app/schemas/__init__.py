@@ -1,5 +1,6 @@
 """Pydantic schemas used across API endpoints."""
 
+from .analyze import AnalyzeRequest, AnalyzeResponse
 from .chat import ChatMessage, ChatRequest, ChatResponse
 from .dictionary import DictionaryRequest, DictionaryResponse
 from .grammar import GrammarCheckRequest, GrammarCheckResponse
@@ -7,6 +8,8 @@ from .speech import TextToSpeechRequest, TextToSpeechResponse, TranscriptionResp
 from .translation import TranslationRequest, TranslationResponse
 
 __all__ = [
+    "AnalyzeRequest",
+    "AnalyzeResponse",
     "ChatMessage",
     "ChatRequest",
     "ChatResponse",
@@ -0,0 +1,41 @@
+from typing import List
+
+from pydantic import BaseModel, Field
+
+from .chat import ChatMessage
+from .grammar import GrammarCheckResponse
+from .translation import TranslationResponse
+
+
+class AnalyzeRequest(BaseModel):
+    """
+    綜合分析請求結構
+
+    說明:
+        定義綜合分析 API 的請求參數，一次取得同一句話的
+        翻譯與文法檢查結果。
+    """
+    text: str = Field(..., description="要同時翻譯與檢查文法的文字")
+    target_language: str | None = Field(
+        default="zh-TW",
+        description="翻譯輸出的 BCP-47 語言標籤；預設為繁體中文",
+    )
+    context: List[ChatMessage] | None = Field(
+        default=None,
+        description="可選的對話歷史，用於提供文法檢查的上下文",
+    )
+    model: str | None = Field(
+        default=None,
+        description="可選的覆蓋模型名稱，同時套用於兩項任務",
+    )
+
+
+class AnalyzeResponse(BaseModel):
+    """
+    綜合分析回應結構
+
+    說明:
+        定義綜合分析 API 的回應格式，包含翻譯與文法檢查兩份結果。
+    """
+    translation: TranslationResponse = Field(..., description="翻譯結果")
+    grammar: GrammarCheckResponse = Field(..., description="文法檢查結果")
@@ -2,6 +2,9 @@ from typing import List, Literal, Optional
 
 from pydantic import BaseModel, Field
 
+# 共用的角色型別：註解一次，pydantic 只編譯一份 discriminator schema
+Role = Literal["system", "user", "assistant"]
+
 
 class ChatMessage(BaseModel):
     """
@@ -11,7 +14,7 @@ class ChatMessage(BaseModel):
         定義單一聊天訊息的格式。
         前端使用 ChatMessage，結構完全相同。
     """
-    role: Literal["system", "user", "assistant"] = Field(
+    role: Role = Field(
         ..., description="聊天角色（依照 OpenAI 類似的 API 規範）"
     )
     content: str = Field(..., description="訊息內容文字")
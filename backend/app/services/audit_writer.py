@@ -0,0 +1,83 @@
+"""
+稽核音訊寫入服務模組
+
+此模組提供背景的稽核音訊持久化功能：工作流程只需把位元組
+丟進有界佇列即可立刻返回，實際的磁碟寫入由單一背景任務
+在執行緒中完成，不佔用請求的關鍵路徑。
+"""
+
+import asyncio
+import logging
+from pathlib import Path
+from typing import Optional, Tuple
+
+from ..utils import save_audio_bytes
+
+log = logging.getLogger(__name__)
+
+
+class AuditWriter:
+    """
+    背景稽核寫入器
+
+    說明:
+        以有界 asyncio.Queue 接收 (目錄, 位元組, 副檔名) 工作項，
+        由單一背景任務依序寫入磁碟。稽核寫入是 best-effort：
+        佇列滿載時丟棄並記錄警告，不阻塞請求。
+    """
+
+    def __init__(self, maxsize: int = 256) -> None:
+        """
+        初始化稽核寫入器
+
+        參數:
+            maxsize: 佇列上限，超過時新的寫入會被丟棄
+        """
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """啟動背景寫入任務（由 FastAPI lifespan 呼叫）"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """停止背景任務，先寫完佇列中剩餘的項目"""
+        if self._task is None:
+            return
+        await self._queue.put(None)
+        await self._task
+        self._task = None
+
+    def submit(self, audio_dir: Path, audio_bytes: bytes, suffix: str = ".wav") -> None:
+        """
+        排入一筆稽核寫入工作
+
+        參數:
+            audio_dir: 音訊儲存目錄
+            audio_bytes: 要持久化的位元組資料
+            suffix: 檔案副檔名
+
+        說明:
+            佇列滿載時丟棄該筆寫入並記錄警告（稽核為 best-effort）。
+            背景任務尚未啟動時退回同步寫入，維持行為正確。
+        """
+        if self._task is None:
+            save_audio_bytes(audio_dir, audio_bytes, suffix=suffix)
+            return
+        try:
+            self._queue.put_nowait((audio_dir, audio_bytes, suffix))
+        except asyncio.QueueFull:
+            log.warning("Audit queue full; dropping one %s write", suffix)
+
+    async def _run(self) -> None:
+        """背景寫入迴圈：逐項在執行緒中落盤"""
+        while True:
+            item = await self._queue.get()
+            if item is None:
+                break
+            audio_dir, audio_bytes, suffix = item
+            try:
+                await asyncio.to_thread(save_audio_bytes, audio_dir, audio_bytes, suffix)
+            except Exception:
+                log.exception("Audit write failed")
@@ -1,12 +1,46 @@
-import json
 import logging
+from contextlib import aclosing
+from functools import lru_cache
 from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 import httpx
+import orjson
 
 
 log = logging.getLogger(__name__)
 
+# Constant SSE terminator frame, allocated once.
+_DONE_FRAME: bytes = b"data: [DONE]\n\n"
+
+
+def _error_frame(message: str) -> bytes:
+    """Build an SSE error frame; only the message varies between failures."""
+    return b"data: " + orjson.dumps({"error": message}) + b"\n\n"
+
+
+@lru_cache(maxsize=32)
+def _payload_skeleton(
+    model: Optional[str],
+    temperature: Optional[float],
+    max_tokens: Optional[int],
+    stream: bool,
+) -> Tuple[Tuple[str, Any], ...]:
+    """Memoize the optional-field items for a (model, temperature, max_tokens) triple.
+
+    Most deployments use a handful of fixed parameter combinations, so the
+    None-check chain runs once per combination instead of per request.
+    """
+    items: List[Tuple[str, Any]] = []
+    if model is not None:
+        items.append(("model", model))
+    if temperature is not None:
+        items.append(("temperature", temperature))
+    if max_tokens is not None:
+        items.append(("max_tokens", max_tokens))
+    if stream:
+        items.append(("stream", True))
+    return tuple(items)
+
 
 class LLMService:
     """Client helper for OpenAI-compatible chat endpoints."""
@@ -20,6 +54,19 @@ class LLMService:
         self.base_url = base_url.rstrip("/")
         self.default_model = default_model
         self.request_timeout = request_timeout
+        # The endpoint never changes for a service instance; format it once.
+        self._chat_url = f"{self.base_url}/chat/completions"
+        # One shared keep-alive client: connection setup (TCP/TLS) is
+        # amortized across requests instead of being paid per call.
+        self._client = httpx.AsyncClient(
+            http2=True,
+            timeout=httpx.Timeout(request_timeout, connect=5.0),
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+        )
+
+    async def aclose(self) -> None:
+        """Release the pooled HTTP connections (called at app shutdown)."""
+        await self._client.aclose()
 
     async def chat(
         self,
@@ -27,25 +74,21 @@ class LLMService:
         model: Optional[str] = None,
         temperature: Optional[float] = None,
         max_tokens: Optional[int] = None,
+        response_format: Optional[Dict[str, Any]] = None,
     ) -> Tuple[str, Dict[str, Any]]:
         """Execute a standard (non-streaming) chat completion request."""
 
-        payload: Dict[str, Any] = {
-            "messages": messages,
-        }
-        chosen_model = model or self.default_model
-        if chosen_model is not None:
-            payload["model"] = chosen_model
-        if temperature is not None:
-            payload["temperature"] = temperature
-        if max_tokens is not None:
-            payload["max_tokens"] = max_tokens
-
-        url = f"{self.base_url}/chat/completions"
+        payload: Dict[str, Any] = dict(
+            _payload_skeleton(model or self.default_model, temperature, max_tokens, False)
+        )
+        payload["messages"] = messages
+        if response_format is not None:
+            payload["response_format"] = response_format
+
+        url = self._chat_url
         log.debug("POST %s payload=%s", url, payload)
 
-        async with httpx.AsyncClient(timeout=self.request_timeout) as client:
-            response = await client.post(url, json=payload)
+        response = await self._client.post(url, json=payload)
 
         try:
             response.raise_for_status()
@@ -55,61 +98,121 @@ class LLMService:
                 f"LLM request failed with status {exc.response.status_code}"
             ) from exc
 
-        parsed = response.json()
+        # orjson parses the (potentially large) completion body at C speed.
+        parsed = orjson.loads(response.content)
         choice = (parsed.get("choices") or [{}])[0]
         content = ((choice.get("message") or {}).get("content")) or ""
         return content, parsed
 
+    async def chat_json_stream(
+        self,
+        messages: List[Dict[str, Any]],
+        model: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        response_format: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Stream a completion and return once a complete JSON object has arrived.
+
+        Structured endpoints only need the first JSON object in the reply;
+        closing the stream right after the closing brace skips whatever the
+        model would have generated afterwards.
+        """
+
+        pieces: List[str] = []
+        raw: Dict[str, Any] = {}
+        json_started = False
+        async with aclosing(
+            self.chat_stream(
+                messages=messages,
+                model=model,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                response_format=response_format,
+            )
+        ) as stream:
+            async for frame in stream:
+                data = frame[5:].strip()
+                if data == b"[DONE]":
+                    break
+                try:
+                    event = orjson.loads(data)
+                except orjson.JSONDecodeError:
+                    continue
+                if "error" in event:
+                    raise RuntimeError(f"LLM streaming request failed: {event['error']}")
+                if event.get("model"):
+                    raw["model"] = event["model"]
+                delta = ((event.get("choices") or [{}])[0].get("delta") or {}).get("content")
+                if not delta:
+                    continue
+                pieces.append(delta)
+                if not json_started:
+                    json_started = "{" in delta
+                # Only attempt a parse when the text plausibly just closed an
+                # object; orjson.loads is the completeness check.
+                if json_started and delta.rstrip().endswith("}"):
+                    text = "".join(pieces)
+                    try:
+                        orjson.loads(text[text.find("{"):])
+                    except orjson.JSONDecodeError:
+                        continue
+                    break
+        return "".join(pieces), raw
+
     async def chat_stream(
         self,
         messages: List[Dict[str, Any]],
         model: Optional[str] = None,
         temperature: Optional[float] = None,
         max_tokens: Optional[int] = None,
+        response_format: Optional[Dict[str, Any]] = None,
     ) -> AsyncIterator[bytes]:
         """Stream chat completion events from the upstream LLM server."""
 
-        payload: Dict[str, Any] = {
-            "messages": messages,
-            "stream": True,
-        }
-        chosen_model = model or self.default_model
-        if chosen_model is not None:
-            payload["model"] = chosen_model
-        if temperature is not None:
-            payload["temperature"] = temperature
-        if max_tokens is not None:
-            payload["max_tokens"] = max_tokens
-
-        url = f"{self.base_url}/chat/completions"
+        payload: Dict[str, Any] = dict(
+            _payload_skeleton(model or self.default_model, temperature, max_tokens, True)
+        )
+        payload["messages"] = messages
+        if response_format is not None:
+            payload["response_format"] = response_format
+
+        url = self._chat_url
         log.debug("STREAM %s payload=%s", url, payload)
 
-        async with httpx.AsyncClient(timeout=None) as client:
-            try:
-                async with client.stream("POST", url, json=payload) as response:
-                    response.raise_for_status()
-                    async for line in response.aiter_lines():
+        try:
+            async with self._client.stream("POST", url, json=payload, timeout=None) as response:
+                response.raise_for_status()
+                # Work on raw bytes: no str decode/encode round-trip per line.
+                # Each yielded value is exactly one "data: ...\n\n" frame so
+                # downstream consumers can parse frame-by-frame.
+                buffer = bytearray()
+                async for chunk in response.aiter_bytes():
+                    buffer += chunk
+                    while (newline := buffer.find(b"\n")) != -1:
+                        line = bytes(buffer[:newline]).rstrip(b"\r")
+                        del buffer[: newline + 1]
                         if not line:
                             continue
-                        if not line.startswith("data:"):
-                            formatted = f"data: {line}"
-                        else:
-                            formatted = line
-                        if not formatted.endswith("\n\n"):
-                            formatted = f"{formatted}\n\n"
-                        yield formatted.encode("utf-8")
-            except httpx.HTTPStatusError as exc:
-                text = exc.response.text[:500]
-                log.error(
-                    "LLM streaming request failed: status=%s body=%s",
-                    exc.response.status_code,
-                    text,
-                )
-                error_payload = json.dumps({"error": text or str(exc)})
-                yield f"data: {error_payload}\n\n".encode("utf-8")
-                yield "data: [DONE]\n\n".encode("utf-8")
-            except Exception as exc:  # pragma: no cover - defensive logging
-                log.exception("LLM streaming unexpected failure")
-                error_payload = json.dumps({"error": str(exc)})
-                yield f"data: {error_payload}\n\n".encode("utf-8")
-                yield "data: [DONE]\n\n".encode("utf-8")
+                        if not line.startswith(b"data:"):
+                            line = b"data: " + line
+                        yield line + b"\n\n"
+                if buffer:
+                    line = bytes(buffer).rstrip(b"\r")
+                    if line:
+                        if not line.startswith(b"data:"):
+                            line = b"data: " + line
+                        yield line + b"\n\n"
+        except httpx.HTTPStatusError as exc:
+            text = exc.response.text[:500]
+            log.error(
+                "LLM streaming request failed: status=%s body=%s",
+                exc.response.status_code,
+                text,
+            )
+            yield _error_frame(text or str(exc))
+            yield _DONE_FRAME
+        except Exception as exc:  # pragma: no cover - defensive logging
+            log.exception("LLM streaming unexpected failure")
+            yield _error_frame(str(exc))
+            yield _DONE_FRAME
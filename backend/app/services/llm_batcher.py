@@ -0,0 +1,186 @@
+"""
+LLM 批次合併服務模組
+
+此模組提供短時間視窗內的請求合併功能：多個獨立的文法檢查或
+翻譯請求會被封裝成單一 JSON 陣列提示，由一次 LLM 呼叫處理，
+讓本地後端的一次前向傳遞分攤多個請求的權重與 KV 成本。
+"""
+
+import asyncio
+import logging
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+import orjson
+
+from ..core import settings
+
+log = logging.getLogger(__name__)
+
+# 附加在原系統提示之後的批次指令
+_BATCH_DIRECTIVE = (
+    "你會收到一個 JSON 陣列，每個元素包含 id 與 text 兩個鍵。"
+    "請對每個 text 獨立執行上述任務，並返回一個 JSON 陣列，"
+    "每個元素包含相同的 id 與一個 result 鍵（result 為該 text 的完整回覆）。"
+    "除了這個 JSON 陣列外，不要輸出任何內容。"
+)
+
+_JSON_ARRAY_RE = re.compile(r"\[.*\]", re.DOTALL)
+
+
+class LLMBatcher:
+    """
+    短視窗請求合併器
+
+    說明:
+        請求透過 submit() 進入佇列；第一個請求啟動一個
+        llm_batch_window_ms 的計時器，視窗內到達的請求（上限
+        llm_batch_max）會被合併成單一 LLM 呼叫。只有單一請求時
+        退回一般的逐筆呼叫，批次解析失敗時也會逐筆重試。
+    """
+
+    def __init__(
+        self,
+        llm_service: Any,
+        system_content: str,
+        window_ms: Optional[int] = None,
+        max_batch: Optional[int] = None,
+    ) -> None:
+        """
+        初始化批次合併器
+
+        參數:
+            llm_service: LLMService 實例
+            system_content: 此端點的固定系統提示
+            window_ms: 合併視窗（毫秒，預設取自設定）
+            max_batch: 單一批次的最大請求數（預設取自設定）
+        """
+        self.llm_service = llm_service
+        self.system_content = system_content
+        self.window_seconds = (
+            window_ms if window_ms is not None else settings.llm_batch_window_ms
+        ) / 1000.0
+        self.max_batch = max_batch or settings.llm_batch_max
+        # 不同模型的請求無法合併，因此以模型名稱分組
+        self._pending: Dict[Optional[str], List[Tuple[str, asyncio.Future]]] = {}
+        self._timers: Dict[Optional[str], asyncio.Task] = {}
+
+    async def submit(
+        self, content: str, model: Optional[str] = None
+    ) -> Tuple[str, Dict[str, Any]]:
+        """
+        提交單一請求並等待其結果
+
+        參數:
+            content: 使用者訊息內容
+            model: 模型名稱（不同模型分開批次）
+
+        返回:
+            Tuple[str, dict]: 與 LLMService.chat 相同的 (content, raw)
+        """
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future = loop.create_future()
+        rows = self._pending.setdefault(model, [])
+        rows.append((content, future))
+        if len(rows) >= self.max_batch:
+            self._flush(model)
+        elif len(rows) == 1:
+            self._timers[model] = loop.create_task(self._delayed_flush(model))
+        return await future
+
+    async def _delayed_flush(self, model: Optional[str]) -> None:
+        """視窗到期後觸發批次送出"""
+        await asyncio.sleep(self.window_seconds)
+        self._timers.pop(model, None)
+        self._flush(model)
+
+    def _flush(self, model: Optional[str]) -> None:
+        """取出待處理請求並排程批次執行"""
+        timer = self._timers.pop(model, None)
+        if timer is not None:
+            timer.cancel()
+        rows = self._pending.pop(model, [])
+        if rows:
+            asyncio.ensure_future(self._run_batch(model, rows))
+
+    async def _run_batch(
+        self, model: Optional[str], rows: List[Tuple[str, asyncio.Future]]
+    ) -> None:
+        """執行一個批次；單筆請求與解析失敗時退回逐筆呼叫"""
+        if len(rows) == 1:
+            content, future = rows[0]
+            await self._run_single(model, content, future)
+            return
+
+        payload = orjson.dumps(
+            [{"id": index, "text": content} for index, (content, _) in enumerate(rows)]
+        ).decode()
+        messages = [
+            {"role": "system", "content": f"{self.system_content}\n\n{_BATCH_DIRECTIVE}"},
+            {"role": "user", "content": payload},
+        ]
+        results: Optional[List[Optional[str]]] = None
+        raw: Dict[str, Any] = {}
+        try:
+            reply, raw = await self.llm_service.chat(
+                messages=messages, model=model, temperature=0.0
+            )
+            results = self._parse_batch_reply(reply, len(rows))
+        except Exception:
+            log.exception("Batched LLM call failed; retrying rows individually")
+
+        if results is None:
+            for content, future in rows:
+                await self._run_single(model, content, future)
+            return
+
+        for (content, future), result in zip(rows, results):
+            if result is None:
+                # 該列缺漏：逐筆重試而不是讓請求失敗
+                await self._run_single(model, content, future)
+            elif not future.done():
+                future.set_result((result, raw))
+
+    async def _run_single(
+        self, model: Optional[str], content: str, future: asyncio.Future
+    ) -> None:
+        """一般的逐筆 LLM 呼叫路徑"""
+        try:
+            result = await self.llm_service.chat(
+                messages=[
+                    {"role": "system", "content": self.system_content},
+                    {"role": "user", "content": content},
+                ],
+                model=model,
+                temperature=0.0,
+            )
+        except Exception as exc:
+            if not future.done():
+                future.set_exception(exc)
+            return
+        if not future.done():
+            future.set_result(result)
+
+    @staticmethod
+    def _parse_batch_reply(reply: str, expected: int) -> Optional[List[Optional[str]]]:
+        """將批次回覆解析為依 id 對齊的結果列表；格式不符時返回 None"""
+        match = _JSON_ARRAY_RE.search(reply)
+        if match is None:
+            return None
+        try:
+            data = orjson.loads(match.group(0))
+        except orjson.JSONDecodeError:
+            return None
+        if not isinstance(data, list):
+            return None
+        results: List[Optional[str]] = [None] * expected
+        for item in data:
+            if not isinstance(item, dict):
+                continue
+            index = item.get("id")
+            result = item.get("result")
+            if isinstance(index, int) and 0 <= index < expected and result is not None:
+                if not isinstance(result, str):
+                    result = orjson.dumps(result).decode()
+                results[index] = result
+        return results
@@ -0,0 +1,144 @@
+"""
+語意快取服務模組
+
+此模組提供以句子向量為鍵的語意快取，用於翻譯與文法檢查等
+確定性 LLM 端點：學生重打的相似句子可以直接命中先前的回應，
+不需要再次呼叫 LLM。
+
+說明:
+    需要可選依賴 sentence-transformers 與 faiss；若未安裝或
+    未透過 enable_semantic_cache 設定啟用，快取會自動停用，
+    所有查詢都視為未命中。模型載入與向量計算都在背景執行緒
+    進行，不會阻塞事件迴圈。
+"""
+
+import asyncio
+import logging
+from typing import Any, List, Optional
+
+from ..core import settings
+
+log = logging.getLogger(__name__)
+
+# 可選依賴：缺少時語意快取自動停用，不影響應用程式啟動
+try:
+    import faiss
+    import numpy as np
+    from sentence_transformers import SentenceTransformer
+
+    _DEPS_AVAILABLE = True
+except ImportError:
+    _DEPS_AVAILABLE = False
+
+
+class SemanticCache:
+    """
+    句子向量語意快取
+
+    說明:
+        以 sentence-transformers 計算輸入文字的正規化向量，
+        存入 FAISS 內積索引；餘弦相似度達到門檻值的查詢
+        直接返回先前儲存的回應。條目數達到上限時丟棄較舊的
+        一半並重建索引，確保長時間執行不會無限成長。
+    """
+
+    def __init__(
+        self,
+        model_name: Optional[str] = None,
+        threshold: Optional[float] = None,
+        max_entries: Optional[int] = None,
+    ) -> None:
+        """
+        初始化語意快取
+
+        參數:
+            model_name: sentence-transformers 模型名稱（預設取自設定）
+            threshold: 視為命中的最低餘弦相似度（預設取自設定）
+            max_entries: 快取條目上限（預設取自設定）
+        """
+        self.model_name = model_name or settings.semantic_cache_model
+        self.threshold = (
+            threshold if threshold is not None else settings.semantic_cache_threshold
+        )
+        self.max_entries = max_entries or settings.semantic_cache_max_entries
+        self._model = None
+        self._index = None
+        self._responses: List[Any] = []
+        self._vectors: List[Any] = []
+        # 序列化模型載入與索引讀寫；實際運算在 to_thread 中進行，
+        # 事件迴圈在等待期間仍可服務其他請求
+        self._lock = asyncio.Lock()
+
+    @property
+    def available(self) -> bool:
+        """當依賴已安裝且設定啟用時返回 True"""
+        return _DEPS_AVAILABLE and settings.enable_semantic_cache
+
+    def _ensure_ready(self) -> None:
+        """延遲載入嵌入模型與索引（第一次使用時才付出載入成本）"""
+        if self._model is None:
+            self._model = SentenceTransformer(self.model_name)
+            dimension = self._model.get_sentence_embedding_dimension()
+            self._index = faiss.IndexFlatIP(dimension)
+
+    def _embed(self, text: str):
+        """計算單一文字的正規化向量（正規化後內積即餘弦相似度）"""
+        vector = self._model.encode([text], normalize_embeddings=True)
+        return np.asarray(vector, dtype="float32")
+
+    def _lookup_sync(self, text: str) -> Optional[Any]:
+        """在背景執行緒中執行的查詢本體"""
+        self._ensure_ready()
+        if self._index.ntotal == 0:
+            return None
+        scores, ids = self._index.search(self._embed(text), 1)
+        if scores[0][0] >= self.threshold:
+            log.debug("Semantic cache hit (score=%.3f)", scores[0][0])
+            return self._responses[ids[0][0]]
+        return None
+
+    def _store_sync(self, text: str, response: Any) -> None:
+        """在背景執行緒中執行的儲存本體，含上限回收"""
+        self._ensure_ready()
+        if len(self._responses) >= self.max_entries:
+            # IndexFlatIP 不支援逐筆刪除：丟棄較舊的一半並重建索引
+            keep = self.max_entries // 2
+            self._responses = self._responses[-keep:]
+            self._vectors = self._vectors[-keep:]
+            self._index = faiss.IndexFlatIP(self._index.d)
+            self._index.add(np.vstack(self._vectors))
+        vector = self._embed(text)
+        self._index.add(vector)
+        self._vectors.append(vector)
+        self._responses.append(response)
+
+    async def lookup(self, text: str) -> Optional[Any]:
+        """
+        查詢語意相似的既有回應
+
+        參數:
+            text: 查詢文字
+
+        返回:
+            Optional[Any]: 相似度達門檻時返回儲存的回應，否則返回 None
+
+        說明:
+            模型載入與向量計算在背景執行緒進行，不阻塞事件迴圈。
+        """
+        if not self.available:
+            return None
+        async with self._lock:
+            return await asyncio.to_thread(self._lookup_sync, text)
+
+    async def store(self, text: str, response: Any) -> None:
+        """
+        儲存文字與對應回應
+
+        參數:
+            text: 原始查詢文字
+            response: 要快取的回應物件
+        """
+        if not self.available:
+            return
+        async with self._lock:
+            await asyncio.to_thread(self._store_sync, text, response)
@@ -4,9 +4,13 @@
 此模組提供基於 Whisper.cpp 的語音轉文字功能封裝。
 """
 
+import atexit
 import logging
+import os
+import shutil
 import subprocess
 import tempfile
+import uuid
 from pathlib import Path
 from typing import Optional
 
@@ -56,6 +60,9 @@ class STTService:
         self.best_of = max(1, best_of)  # 確保 best_of 至少為 1
         self.temperature = max(0.0, temperature)  # 確保溫度不為負值
         self.print_timestamps = print_timestamps
+        # 共用的工作目錄：避免每次轉寫都 mkdtemp/rmtree 一整個目錄
+        self._workdir = Path(tempfile.mkdtemp(prefix="whisper_workdir_"))
+        atexit.register(shutil.rmtree, self._workdir, ignore_errors=True)
 
     def transcribe(self, audio_path: Path) -> str:
         """
@@ -74,50 +81,117 @@ class STTService:
         if self.use_mock or not self._is_runtime_available():
             return self._mock_transcription(audio_path)
 
-        # 使用臨時目錄處理 Whisper 輸出
-        with tempfile.TemporaryDirectory(prefix="whisper_tmp_") as tmp_dir:
-            # Whisper 會將輸出寫入指定前綴的旁邊，我們之後會清理
-            output_prefix = Path(tmp_dir) / "transcription"
-            
-            # 構建 Whisper 命令列參數
-            command = [
-                str(self.binary_path),
-                "-m", str(self.model_path),  # 模型路徑
-                "-f", str(audio_path),  # 音訊檔案
-                "-otxt",  # 輸出文字格式
-                "-of", str(output_prefix),  # 輸出檔案前綴
-                "-l", self.language,  # 語言設定
-            ]
-            
-            # 添加進階參數
-            command.extend(["--threads", str(self.threads)])
-            command.extend(["--beam-size", str(self.beam_size)])
-            command.extend(["--best-of", str(self.best_of)])
-            command.extend(["--temperature", f"{self.temperature:.2f}"])
-            
-            if not self.print_timestamps:
-                command.append("--no-timestamps")
-            command.append("--no-fallback")
-            
+        # 在共用工作目錄內使用唯一前綴，省去每次請求的 mkdtemp/rmtree
+        output_prefix = self._workdir / f"t_{uuid.uuid4().hex}"
+
+        # 構建 Whisper 命令列參數
+        command = [
+            str(self.binary_path),
+            "-m", str(self.model_path),  # 模型路徑
+            "-f", str(audio_path),  # 音訊檔案
+            "-otxt",  # 輸出文字格式
+            "-of", str(output_prefix),  # 輸出檔案前綴
+            "-l", self.language,  # 語言設定
+        ]
+
+        # 添加進階參數
+        command.extend(["--threads", str(self.threads)])
+        command.extend(["--beam-size", str(self.beam_size)])
+        command.extend(["--best-of", str(self.best_of)])
+        command.extend(["--temperature", f"{self.temperature:.2f}"])
+
+        if not self.print_timestamps:
+            command.append("--no-timestamps")
+        command.append("--no-fallback")
+
+        if log.isEnabledFor(logging.DEBUG):
+            # join 是即時求值的，僅在 DEBUG 啟用時才付出字串組裝成本
             log.debug("執行 whisper.cpp 命令: %s", " ".join(command))
-            
+
+        transcript_path = f"{output_prefix}.txt"
+        try:
+            # 執行 Whisper 命令
+            subprocess.run(
+                command,
+                check=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+            )
+
+            # 讀取轉寫結果（單次 os.read，避開 pathlib 包裝層；
+            # 轉寫文字遠小於 1 MiB 的上限緩衝）
+            fd = os.open(transcript_path, os.O_RDONLY)
+            try:
+                data = os.read(fd, 1 << 20)
+            finally:
+                os.close(fd)
+            return data.decode("utf-8").strip()
+
+        except subprocess.CalledProcessError as exc:
+            log.exception("whisper.cpp 執行失敗: %s", exc.stderr.decode())
+            raise RuntimeError("語音轉文字推理失敗") from exc
+        finally:
+            # 清理本次請求的轉寫輸出
             try:
-                # 執行 Whisper 命令
-                subprocess.run(
-                    command,
-                    check=True,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                )
-                
-                # 讀取轉寫結果
-                transcript_path = Path(f"{output_prefix}.txt")
-                transcript = transcript_path.read_text(encoding="utf-8").strip()
-                return transcript
-                
-            except subprocess.CalledProcessError as exc:
-                log.exception("whisper.cpp 執行失敗: %s", exc.stderr.decode())
-                raise RuntimeError("語音轉文字推理失敗") from exc
+                os.unlink(transcript_path)
+            except OSError:
+                pass
+
+    def transcribe_bytes(self, audio_bytes: bytes) -> str:
+        """
+        將記憶體中的音訊位元組直接轉寫為文字
+
+        參數:
+            audio_bytes: 原始音訊位元組資料（WAV 格式）
+
+        返回:
+            str: 轉寫後的文字內容
+
+        異常:
+            RuntimeError: 當語音轉文字推理失敗時拋出
+
+        說明:
+            透過 stdin 將音訊傳給 whisper.cpp（-f -），轉寫結果由
+            stdout 讀回，完全省去臨時檔案的寫入、讀取與刪除。
+        """
+        # 如果使用模擬模式或執行環境不可用，返回模擬轉寫
+        if self.use_mock or not self._is_runtime_available():
+            return self._mock_transcription(None)
+
+        # 構建 Whisper 命令列參數（stdin 輸入、stdout 輸出）
+        command = [
+            str(self.binary_path),
+            "-m", str(self.model_path),  # 模型路徑
+            "-f", "-",  # 從 stdin 讀取音訊
+            "-l", self.language,  # 語言設定
+        ]
+
+        # 添加進階參數
+        command.extend(["--threads", str(self.threads)])
+        command.extend(["--beam-size", str(self.beam_size)])
+        command.extend(["--best-of", str(self.best_of)])
+        command.extend(["--temperature", f"{self.temperature:.2f}"])
+
+        if not self.print_timestamps:
+            command.append("--no-timestamps")
+        command.append("--no-fallback")
+
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("執行 whisper.cpp 命令（stdin 模式）: %s", " ".join(command))
+
+        try:
+            completed = subprocess.run(
+                command,
+                input=audio_bytes,
+                check=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+            )
+        except subprocess.CalledProcessError as exc:
+            log.exception("whisper.cpp 執行失敗: %s", exc.stderr.decode())
+            raise RuntimeError("語音轉文字推理失敗") from exc
+
+        return completed.stdout.decode("utf-8").strip()
 
     def _is_runtime_available(self) -> bool:
         """
@@ -1,14 +1,19 @@
-import base64
+import io
 import logging
 import math
-import os
 import struct
 import subprocess
-import tempfile
 import wave
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, Tuple
 
+# Optional acceleration: vectorized tone synthesis for the mock path.
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 
 log = logging.getLogger(__name__)
 
@@ -35,21 +40,23 @@ class TTSService:
         length_scale: Optional[float] = None,
         noise_scale: Optional[float] = None,
         noise_w: Optional[float] = None,
-    ) -> Tuple[str, int]:
+    ) -> Tuple[bytes, int]:
+        """Synthesize speech and return raw WAV bytes with the sample rate.
+
+        Callers that need base64 encode once at the response boundary; keeping
+        bytes here avoids an encode/decode round-trip per request.
+        """
         if self.use_mock or not self._is_runtime_available():
             return self._mock_audio()
 
-        with tempfile.NamedTemporaryFile(
-            suffix=".wav", delete=False, prefix="piper_out_"
-        ) as tmp_file:
-            output_path = Path(tmp_file.name)
-
+        # "-" makes Piper write the WAV straight to stdout: no temp file
+        # create/write/read/unlink cycle per synthesis.
         command = [
             str(self.binary_path),
             "--model",
             str(self.model_path),
             "--output_file",
-            str(output_path),
+            "-",
         ]
 
         if voice:
@@ -61,66 +68,77 @@ class TTSService:
         if noise_w is not None:
             command.extend(["--noise_w", f"{noise_w:.4f}"])
 
-        log.debug("Executing Piper command: %s", " ".join(command))
+        if log.isEnabledFor(logging.DEBUG):
+            # The join is eager; only pay for it when DEBUG is actually on.
+            log.debug("Executing Piper command: %s", " ".join(command))
         try:
-            subprocess.run(
+            completed = subprocess.run(
                 command,
-                input=text,
-                text=True,
-                encoding="utf-8",
-                errors="ignore",
+                input=text.encode("utf-8", errors="ignore"),
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
                 check=True,
             )
         except subprocess.CalledProcessError as exc:
-            log.exception("Piper synthesis failed: %s", exc.stderr)
+            log.exception("Piper synthesis failed: %s", exc.stderr.decode(errors="ignore"))
             raise RuntimeError("Text-to-speech synthesis failed") from exc
 
-        audio_bytes = output_path.read_bytes()
-        try:
-            with wave.open(str(output_path), "rb") as wav_file:
-                sample_rate = wav_file.getframerate()
-        finally:
-            try:
-                os.remove(output_path)
-            except OSError:
-                log.warning("Failed to remove temporary Piper output: %s", output_path)
+        audio_bytes = completed.stdout
+        return audio_bytes, self._wav_sample_rate(audio_bytes)
+
+    def _wav_sample_rate(self, audio_bytes: bytes) -> int:
+        """Read the sample rate straight from the RIFF header.
 
-        encoded = base64.b64encode(audio_bytes).decode("ascii")
-        return encoded, sample_rate
+        Piper writes canonical PCM WAV files, so the rate sits at byte offset
+        24 of the fmt chunk; parsing it inline avoids reopening the file with
+        the wave module just for one field.
+        """
+        if len(audio_bytes) >= 28 and audio_bytes[:4] == b"RIFF":
+            return int.from_bytes(audio_bytes[24:28], "little")
+        return self.default_sample_rate
 
     def _is_runtime_available(self) -> bool:
         """Return True when both the Piper binary and voice model are present."""
         return self.binary_path.exists() and self.model_path.exists()
 
-    def _mock_audio(self) -> Tuple[str, int]:
-        """Generate a short tone so that the pipeline remains testable without Piper."""
+    def _mock_audio(self) -> Tuple[bytes, int]:
+        """Return a short tone so that the pipeline remains testable without Piper."""
         log.warning("Using mock TTS audio. Verify Piper binary and model paths.")
-        duration_seconds = 0.5
-        sample_rate = self.default_sample_rate
-        frequency = 440.0  # A4 reference tone
-
-        total_samples = int(duration_seconds * sample_rate)
-        buffer = bytearray()
+        return _build_mock_wav(self.default_sample_rate), self.default_sample_rate
+
+
+@lru_cache(maxsize=4)
+def _build_mock_wav(sample_rate: int) -> bytes:
+    """Generate the 0.5s 440 Hz reference tone once per sample rate.
+
+    The tone does not depend on the request text, so repeated mocked requests
+    reuse the same WAV bytes instead of recomputing ~11k samples each time.
+    """
+    duration_seconds = 0.5
+    frequency = 440.0  # A4 reference tone
+
+    total_samples = int(duration_seconds * sample_rate)
+    if np is not None:
+        # One vectorized sin over the whole buffer instead of a
+        # per-sample Python loop.
+        indices = np.arange(total_samples, dtype=np.float32)
+        angular_step = 2.0 * np.pi * frequency / sample_rate
+        buffer = (32767.0 * np.sin(angular_step * indices)).astype("<i2").tobytes()
+    else:
+        # Preallocate and pack in place: no per-sample bytes objects and the
+        # format string is parsed once.
+        buffer = bytearray(total_samples * 2)
+        pack_sample = struct.Struct("<h").pack_into
+        angular_step = 2 * math.pi * frequency / sample_rate
         for n in range(total_samples):
-            sample = int(
-                32767
-                * math.sin(2 * math.pi * frequency * (n / sample_rate))
-            )
-            buffer.extend(struct.pack("<h", sample))
-
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp_file:
-            output_path = Path(tmp_file.name)
-
-        with wave.open(str(output_path), "wb") as wav_file:
-            wav_file.setnchannels(1)
-            wav_file.setsampwidth(2)
-            wav_file.setframerate(sample_rate)
-            wav_file.writeframes(buffer)
+            pack_sample(buffer, n * 2, int(32767 * math.sin(angular_step * n)))
 
-        audio_bytes = output_path.read_bytes()
-        os.remove(output_path)
+    # Assemble the WAV fully in memory; no temp file round trip.
+    output = io.BytesIO()
+    with wave.open(output, "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(buffer)
 
-        encoded = base64.b64encode(audio_bytes).decode("ascii")
-        return encoded, sample_rate
+    return output.getvalue()
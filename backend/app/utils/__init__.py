@@ -1,5 +1,5 @@
 """Helper utilities shared across the backend application."""
 
-from .audio import decode_audio_base64, save_audio_bytes
+from .audio import decode_audio_base64, save_audio_batch, save_audio_bytes
 
-__all__ = ["decode_audio_base64", "save_audio_bytes"]
+__all__ = ["decode_audio_base64", "save_audio_batch", "save_audio_bytes"]
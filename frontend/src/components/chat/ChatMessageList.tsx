@@ -43,6 +43,11 @@ type ActionMenuState = {
   position: { top: number; left: number }  // 選單位置
 }
 
+/**
+ * 長對話中最多同時渲染的訊息數量
+ */
+const MAX_RENDERED_MESSAGES = 50
+
 /**
  * 聊天訊息列表元件屬性
  */
@@ -398,13 +403,19 @@ export default function ChatMessageList({
     [grammarStates],
   )
 
+  // 長對話只渲染最近的訊息：DOM 節點數（與捲動/排版成本）不再隨
+  // 歷史長度無限成長。messages 陣列本身保持完整，後端仍收到全部歷史。
+  const firstRenderedIndex =
+    messages.length > MAX_RENDERED_MESSAGES ? messages.length - MAX_RENDERED_MESSAGES : 0
+
   return (
     <div
       ref={scrollBoxRef}
       className={`chat-message-list chat-scroll card relative h-[65vh] overflow-y-auto space-y-3 bg-gray-900/50 dark:bg-gray-900/50 border-gray-800 anim-scale-in ${className}`}
       onClick={handleBackdropClick}
     >
-      {messages.map((message, idx) => {
+      {messages.slice(firstRenderedIndex).map((message, offset) => {
+        const idx = firstRenderedIndex + offset
         const key = getMessageKey(message)
         const isUser = message.role === 'user'
         const messageId = `${key}-msg-${idx}`
@@ -230,18 +230,39 @@ export default function ChatPage() {
       setIsSending(true)
 
       let assistantReply = ''
+      let cancelStreamFlush: (() => void) | null = null
       try {
         if (streaming) {
           let accumulator = ''
-          updateMessages((prev) => [...prev, { role: 'assistant', content: '' }])
-          for await (const token of chatStream({ messages: conversation })) {
-            accumulator += token
+          let flushScheduled = false
+          let flushCancelled = false
+          // Coalesce token updates to one state write per animation frame:
+          // a fast model can emit dozens of deltas per second, and each
+          // update re-renders the list and re-serializes localStorage.
+          const flush = () => {
+            flushScheduled = false
+            if (flushCancelled) return
             updateMessages((prev) => {
               const updated = [...prev]
               updated[updated.length - 1] = { role: 'assistant', content: accumulator }
               return updated
             })
           }
+          // A pending frame must not fire after the catch below appends an
+          // error bubble, or it would overwrite that bubble.
+          cancelStreamFlush = () => {
+            flushCancelled = true
+          }
+          updateMessages((prev) => [...prev, { role: 'assistant', content: '' }])
+          for await (const token of chatStream({ messages: conversation })) {
+            accumulator += token
+            if (!flushScheduled) {
+              flushScheduled = true
+              requestAnimationFrame(flush)
+            }
+          }
+          flush()
+          cancelStreamFlush = null
           assistantReply = accumulator
         } else {
           const response = await chat({ messages: conversation })
@@ -249,6 +270,7 @@ export default function ChatPage() {
           updateMessages((prev) => [...prev, { role: 'assistant', content: assistantReply }])
         }
       } catch (error: any) {
+        cancelStreamFlush?.()
         updateMessages((prev) => [
           ...prev,
           { role: 'assistant', content: `(${t('common.error')}: ${error?.message || error})` },
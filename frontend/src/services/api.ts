@@ -90,27 +90,26 @@ export async function* chatStream(
     throw new Error(`串流請求失敗: ${res.status}`)
   }
 
-  const reader = res.body.getReader()
-  const decoder = new TextDecoder('utf-8')
+  // TextDecoderStream 在原生層完成 UTF-8 解碼，
+  // 省去每個區塊一次 JS 端的 decoder.decode 呼叫
+  const reader = res.body.pipeThrough(new TextDecoderStream()).getReader()
   let buffer = ''
 
   while (true) {
     const { done, value } = await reader.read()
-    
-    if (done) {
-      buffer += decoder.decode()
-      break
-    }
-    
-    buffer += decoder.decode(value, { stream: true })
+
+    if (done) break
+
+    buffer += value
+    let start = 0
     let idx
-    
-    // 處理完整的 SSE 事件（以 \n\n 分隔）
-    while ((idx = buffer.indexOf('\n\n')) !== -1) {
-      const chunk = buffer.slice(0, idx)
-      buffer = buffer.slice(idx + 2)
-      const line = chunk.trim()
-      
+
+    // 處理完整的 SSE 事件（以 \n\n 分隔）；用游標單次掃描，
+    // 每個事件不再重切整個緩衝字串
+    while ((idx = buffer.indexOf('\n\n', start)) !== -1) {
+      const line = buffer.slice(start, idx).trim()
+      start = idx + 2
+
       if (!line) continue
       
       if (line.startsWith('data:')) {
@@ -141,6 +140,11 @@ export async function* chatStream(
         }
       }
     }
+
+    // 只在迴圈結束時切掉已處理的前綴，保留未完成的事件片段
+    if (start > 0) {
+      buffer = buffer.slice(start)
+    }
   }
 }
 